@@ -40,7 +40,7 @@ class AMCBilling(models.Model):
         UPI = "UPI", "UPI"
 
     amc = models.ForeignKey(AMC, on_delete=models.CASCADE, related_name="billings")
-    bill_number = models.CharField(max_length=100)
+    bill_number = models.CharField(max_length=100, db_index=True)
     bill_date = models.DateField()
     period_from = models.DateField()
     period_to = models.DateField()
@@ -55,6 +55,12 @@ class AMCBilling(models.Model):
     updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, related_name="amcbilling_updated", blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Billing run: periods already billed per AMC
+            models.Index(fields=['amc', 'period_from', 'period_to'], name='amcbill_amc_period_idx'),
+        ]
+
     def __str__(self):
         return f"Bill {self.bill_number} - AMC {self.amc.amc_number}"
 
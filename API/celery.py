@@ -3,6 +3,7 @@ Celery configuration for the API project.
 """
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 from django.conf import settings
 
 # Set the default Django settings module for the 'celery' program.
@@ -25,3 +26,9 @@ def debug_task(self):
     """Debug task for testing Celery setup"""
     print(f'Request: {self.request!r}')
 
+
+@worker_process_init.connect
+def prewarm_db_connection(**kwargs):
+    """Open each worker process's database connection up front; CONN_MAX_AGE keeps it for later tasks"""
+    from django.db import connection
+    connection.ensure_connection()
@@ -112,6 +112,10 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', ''),
         'PORT': os.getenv('DB_PORT', ''),
+        # Seconds to keep a connection open for reuse by later requests/tasks (0 closes after each)
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        # Check a reused connection is still alive before the first query of each request/task
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -174,6 +178,11 @@ else:
     # Example: STATIC_URL = 'https://cdn.example.com/static/'
     # Example: MEDIA_URL = 'https://storage.example.com/media/'
 
+# File Upload Configuration
+# Uploads above this size (bytes) are streamed to a temporary file instead of
+# being buffered in memory (Django's default threshold is 2.5 MB)
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv('FILE_UPLOAD_MAX_MEMORY_SIZE', 1024 * 1024))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -470,6 +479,25 @@ SWAGGER_SETTINGS = {
     'DEFAULT_MODEL_RENDERING': 'example'  # Show example values for models
 }
 
+# Cache Configuration
+# Defaults to a per-process in-memory cache; point CACHE_BACKEND at
+# 'django.core.cache.backends.redis.RedisCache' and CACHE_LOCATION at a
+# redis:// URL to share the cache across workers.
+# A shared backend (Redis or memcached) is required in production with more than one
+# worker process: cached list_profiles pages are invalidated by bumping a version key,
+# and with the in-memory default only the process that handled the write sees the bump
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# Seconds to cache the generated Swagger/OpenAPI schema (0 disables caching)
+SWAGGER_CACHE_TIMEOUT = int(os.getenv('SWAGGER_CACHE_TIMEOUT', 10 * 60))
+# Changing this (e.g. to the deployed git SHA) invalidates previously cached schemas
+SWAGGER_CACHE_KEY_PREFIX = os.getenv('SWAGGER_CACHE_KEY_PREFIX', 'swagger')
+
 # Celery Configuration
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'django-db')
@@ -481,6 +509,9 @@ CELERY_RESULT_SERIALIZER = 'json'
 
 # Celery Beat Configuration
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+# Longest beat sleeps between ticks; each tick polls the DB for schedule changes.
+# Due tasks still fire on time, edits to periodic tasks are picked up within this many seconds
+CELERY_BEAT_MAX_LOOP_INTERVAL = int(os.getenv('CELERY_BEAT_MAX_LOOP_INTERVAL', 60))
 
 # Celery Task Configuration
 CELERY_TASK_TRACK_STARTED = True
@@ -488,6 +519,37 @@ CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 CELERY_TASK_SOFT_TIME_LIMIT = 25 * 60  # 25 minutes
 CELERY_WORKER_SEND_TASK_EVENTS = True
 CELERY_TASK_SEND_SENT_EVENT = True
+# Each worker process reserves one task at a time, so a long payroll/AMC billing run
+# doesn't hold queued tasks that an idle process could pick up (pair with `worker -Ofair`)
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(os.getenv('CELERY_WORKER_PREFETCH_MULTIPLIER', 1))
+
+# Optional dedicated queues; leave unset to keep tasks on the default queue.
+# When set, run a worker with `-Q <queue>` (see CELERY_SETUP.md)
+# Long-running batch tasks (payroll, AMC billing)
+SCHEDULER_LONG_RUNNING_QUEUE = os.getenv('SCHEDULER_LONG_RUNNING_QUEUE', '')
+# Network-bound email and reminder tasks, for a worker on an eventlet/gevent pool
+SCHEDULER_IO_QUEUE = os.getenv('SCHEDULER_IO_QUEUE', '')
+
+CELERY_TASK_ROUTES = {}
+if SCHEDULER_LONG_RUNNING_QUEUE:
+    CELERY_TASK_ROUTES.update({
+        task: {'queue': SCHEDULER_LONG_RUNNING_QUEUE}
+        for task in (
+            'Scheduler.tasks.generate_monthly_payroll',
+            'Scheduler.tasks.generate_amc_billing',
+        )
+    })
+if SCHEDULER_IO_QUEUE:
+    CELERY_TASK_ROUTES.update({
+        task: {'queue': SCHEDULER_IO_QUEUE}
+        for task in (
+            'Scheduler.tasks.send_scheduled_email',
+            'Scheduler.tasks.send_tender_emd_reminders',
+        )
+    })
+
+# Rows per multi-row INSERT when the scheduler bulk-creates payroll records
+PAYROLL_BULK_BATCH_SIZE = int(os.getenv('PAYROLL_BULK_BATCH_SIZE', 500))
 
 # CORS Configuration
 CORS_ALLOW_CREDENTIALS = True
@@ -4,6 +4,7 @@ URL configuration for API project.
 The `urlpatterns` list routes URLs to views. For more information please see:
     https://docs.djangoproject.com/en/4.2/topics/http/urls/
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include, re_path
 from rest_framework.permissions import AllowAny
@@ -81,6 +82,11 @@ All list endpoints are paginated with 20 items per page by default.
    ],
 )
 
+# Generated schemas are cached so drf-yasg does not re-walk every view per request
+SCHEMA_CACHE_KWARGS = (
+    {'key_prefix': settings.SWAGGER_CACHE_KEY_PREFIX} if settings.SWAGGER_CACHE_TIMEOUT else None
+)
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     
@@ -101,7 +107,7 @@ urlpatterns = [
     path('api/', include('Profiles.urls')),
     
     # Swagger/OpenAPI Documentation
-    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    re_path(r'^swagger/$', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    re_path(r'^redoc/$', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=settings.SWAGGER_CACHE_TIMEOUT, cache_kwargs=SCHEMA_CACHE_KWARGS), name='schema-json'),
+    re_path(r'^swagger/$', schema_view.with_ui('swagger', cache_timeout=settings.SWAGGER_CACHE_TIMEOUT, cache_kwargs=SCHEMA_CACHE_KWARGS), name='schema-swagger-ui'),
+    re_path(r'^redoc/$', schema_view.with_ui('redoc', cache_timeout=settings.SWAGGER_CACHE_TIMEOUT, cache_kwargs=SCHEMA_CACHE_KWARGS), name='schema-redoc'),
 ]
@@ -28,6 +28,12 @@ class ActivityLog(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, related_name="activitylogs_updated", blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Activity feeds: one entity's logs, newest first
+            models.Index(fields=['entity_type', 'entity_id', '-created_at'], name='activity_entity_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.entity_type} {self.entity_id} - {self.action}"
 
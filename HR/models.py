@@ -117,6 +117,12 @@ class PayrollRecord(models.Model):
     updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, related_name="payroll_updated", blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Monthly payroll run: which employees already have a record for the period
+            models.Index(fields=['period_from', 'employee'], name='payroll_period_emp_idx'),
+        ]
+
     def __str__(self):
         return f"Payroll {self.id} - {self.employee}"
 
@@ -10,7 +10,9 @@ class NotificationsConfig(AppConfig):
     name = 'Notifications'
     
     def ready(self):
-        """Initialize Firebase Admin SDK when Django starts"""
+        """Register notification signal handlers and initialize Firebase Admin SDK when Django starts"""
+        from . import signals
+        
         # Use both print and logger for visibility
         print("🔧 Notifications app ready() called - initializing Firebase Admin SDK...")
         logger.info("Notifications app ready() called - initializing Firebase Admin SDK...")
@@ -0,0 +1,40 @@
+"""
+Cache helpers for email templates.
+"""
+from django.core.cache import cache
+
+from .models import EmailTemplate
+
+# Seconds a template's name, subject and body are reused before re-reading the database.
+# Saving or deleting a template clears its entry; with a per-process cache backend
+# (the locmem default) other processes pick up edits once this expires
+EMAIL_TEMPLATE_CACHE_TTL = 5 * 60
+
+
+def email_template_cache_key(template_id):
+    """Cache key for an email template's content"""
+    return f"notifications:emailtemplate:{template_id}"
+
+
+def get_email_template_content(template_id):
+    """
+    Get an email template's content, from the cache when possible.
+    
+    Returns:
+        Tuple of (name, subject, body)
+    
+    Raises:
+        EmailTemplate.DoesNotExist: If there is no template with this id
+    """
+    key = email_template_cache_key(template_id)
+    content = cache.get(key)
+    if content is None:
+        template = EmailTemplate.objects.only('id', 'name', 'subject', 'body').get(id=template_id)
+        content = (template.name, template.subject, template.body)
+        cache.set(key, content, EMAIL_TEMPLATE_CACHE_TTL)
+    return content
+
+
+def clear_email_template_cache(template_id):
+    """Drop an email template's cached content"""
+    cache.delete(email_template_cache_key(template_id))
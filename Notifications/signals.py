@@ -0,0 +1,14 @@
+"""
+Notification Signals
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import EmailTemplate
+from .cache import clear_email_template_cache
+
+
+@receiver([post_save, post_delete], sender=EmailTemplate)
+def email_template_changed(sender, instance, **kwargs):
+    """Drop the cached content when an email template is edited or removed"""
+    clear_email_template_cache(instance.id)
@@ -8,6 +8,9 @@ from .models import Notification, DeviceToken
 
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row INSERT when notifying a list of recipients
+NOTIFICATION_BULK_BATCH_SIZE = 500
+
 
 def send_fcm_push_notification(user, title, message, notification_type, notification_id=None):
     """
@@ -175,23 +178,26 @@ def send_notification(recipient, title, message, notification_type, channel=Noti
         Notification instance or list of Notification instances
     """
     if isinstance(recipient, list):
-        notifications = []
-        for user in recipient:
-            notification = Notification.objects.create(
+        # One multi-row INSERT for all recipients; ids are returned for the push deep links
+        sent_at = timezone.now()
+        notifications = Notification.objects.bulk_create([
+            Notification(
                 recipient=user,
                 title=title,
                 message=message,
                 type=notification_type,
                 channel=channel,
-                sent_at=timezone.now(),
+                sent_at=sent_at,
                 created_by=created_by
             )
-            notifications.append(notification)
-            
-            # Send FCM push notification if channel includes Push
-            if channel == Notification.Channel.PUSH or channel == Notification.Channel.IN_APP:
+            for user in recipient
+        ], batch_size=NOTIFICATION_BULK_BATCH_SIZE)
+        
+        # Send FCM push notification if channel includes Push
+        if channel == Notification.Channel.PUSH or channel == Notification.Channel.IN_APP:
+            for notification in notifications:
                 send_fcm_push_notification(
-                    user=user,
+                    user=notification.recipient,
                     title=title,
                     message=message,
                     notification_type=notification_type,
@@ -222,7 +228,7 @@ def send_notification(recipient, title, message, notification_type, channel=Noti
         return notification
 
 
-def send_notification_to_owners(title, message, notification_type, channel=Notification.Channel.IN_APP, created_by=None):
+def send_notification_to_owners(title, message, notification_type, channel=Notification.Channel.IN_APP, created_by=None, owners=None):
     """
     Send a notification to all superadmins (owners).
     
@@ -232,11 +238,13 @@ def send_notification_to_owners(title, message, notification_type, channel=Notif
         notification_type: Notification type (from Notification.Type)
         channel: Notification channel (default: IN_APP)
         created_by: User who created the notification (optional)
+        owners: Superadmin users already loaded by the caller (optional, queried if omitted)
     
     Returns:
         List of Notification instances
     """
-    owners = User.objects.filter(is_superuser=True)
+    if owners is None:
+        owners = User.objects.filter(is_superuser=True)
     return send_notification(recipient=list(owners), title=title, message=message, 
                            notification_type=notification_type, channel=channel, created_by=created_by)
 
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ProfilesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Profiles'
+
+    def ready(self):
+        """Register profile signal handlers"""
+        from . import signals
@@ -0,0 +1,63 @@
+"""
+Cache helpers for profile listings.
+
+Invalidation bumps a version key in the default cache, so it only reaches every
+worker process when CACHES points at a shared backend (Redis or memcached).
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+# Seconds a cached list_profiles page is served without hitting the database
+PROFILE_LIST_PAGE_TTL = 30
+# Seconds a cached page is kept around as a fallback if the database errors
+PROFILE_LIST_PAGE_STALE_TTL = 10 * 60
+
+PROFILE_LIST_VERSION_KEY = 'profiles:list:version'
+
+
+def profile_list_page_cache_key(request):
+    """
+    Cache key for a list_profiles page, based on the absolute request URI.
+    Scheme and host are part of the key because the cached next/previous links are absolute.
+    """
+    digest = hashlib.blake2b(request.build_absolute_uri().encode(), digest_size=16).hexdigest()
+    return f"profiles:list:page:{digest}"
+
+
+def get_profile_list_version():
+    """Current generation of the profile listing; cached pages from older ones are stale"""
+    return cache.get_or_set(PROFILE_LIST_VERSION_KEY, time.time_ns, None)
+
+
+def bump_profile_list_version():
+    """Mark every cached list_profiles page as stale"""
+    cache.set(PROFILE_LIST_VERSION_KEY, time.time_ns(), None)
+
+
+def get_cached_profile_list_page(request):
+    """
+    Get the cached page for this request.
+    
+    Returns:
+        Tuple of (data, is_fresh), or (None, False) if nothing is cached
+    """
+    entry = cache.get(profile_list_page_cache_key(request))
+    if entry is None:
+        return None, False
+    is_fresh = (
+        entry['version'] == get_profile_list_version()
+        and entry['fresh_until'] > time.time()
+    )
+    return entry['data'], is_fresh
+
+
+def set_cached_profile_list_page(request, data):
+    """Cache a rendered list_profiles page"""
+    entry = {
+        'data': data,
+        'version': get_profile_list_version(),
+        'fresh_until': time.time() + PROFILE_LIST_PAGE_TTL,
+    }
+    cache.set(profile_list_page_cache_key(request), entry, PROFILE_LIST_PAGE_STALE_TTL)
@@ -1,10 +1,46 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import update_session_auth_hash
+from django.contrib.auth.hashers import check_password
 from .models import Profile, MobileNumber
 
 
-class CurrentUserProfileSerializer(serializers.ModelSerializer):
+def get_primary_mobile_number(user):
+    """
+    Get the user's primary mobile number, falling back to their first one.
+    Reads from the prefetched mobile_numbers when available.
+    """
+    if user is None:
+        return None
+    mobiles = sorted(user.mobile_numbers.all(), key=lambda mobile: mobile.id)
+    for mobile in mobiles:
+        if mobile.is_primary:
+            return mobile.mobile_number
+    # If no primary, get first mobile number
+    if mobiles:
+        return mobiles[0].mobile_number
+    return None
+
+
+class EagerLoadingMixin:
+    """
+    Lets a serializer declare the relations it traverses so views can build
+    their querysets from the serializer instead of hand-syncing joins.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Apply the serializer's select_related/prefetch_related lookups"""
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        return queryset
+
+
+class CurrentUserProfileSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for current user's profile details"""
     photo_url = serializers.SerializerMethodField()
     aadhar_card_url = serializers.SerializerMethodField()
@@ -29,6 +65,9 @@ class CurrentUserProfileSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
     
+    select_related_fields = ('user',)
+    prefetch_related_fields = ('user__mobile_numbers',)
+    
     def get_photo_url(self, obj):
         """Get photo URL"""
         if obj.photo:
@@ -58,17 +97,7 @@ class CurrentUserProfileSerializer(serializers.ModelSerializer):
     
     def get_phone_number(self, obj):
         """Get primary phone number"""
-        try:
-            mobile = MobileNumber.objects.filter(user=obj.user, is_primary=True).first()
-            if mobile:
-                return mobile.mobile_number
-            # If no primary, get first mobile number
-            mobile = MobileNumber.objects.filter(user=obj.user).first()
-            if mobile:
-                return mobile.mobile_number
-        except:
-            pass
-        return None
+        return get_primary_mobile_number(obj.user)
 
 
 class CurrentUserProfileUpdateSerializer(serializers.Serializer):
@@ -101,6 +130,47 @@ class CurrentUserProfileUpdateSerializer(serializers.Serializer):
     new_password = serializers.CharField(write_only=True, required=False, allow_blank=True)
     confirm_password = serializers.CharField(write_only=True, required=False, allow_blank=True)
     
+    USER_FIELDS = ('username', 'email', 'first_name', 'last_name')
+    PROFILE_FIELDS = (
+        'date_of_birth', 'gender', 'address', 'city', 'state',
+        'pin_code', 'country', 'aadhar_number', 'pan_number'
+    )
+    FILE_FIELDS = ('photo', 'aadhar_card', 'pan_card')
+    PASSWORD_FIELDS = ('current_password', 'new_password', 'confirm_password')
+    
+    def has_changes(self):
+        """
+        Check the submitted data against the current profile without touching
+        the database, so no-op submissions can skip validation and saving.
+        """
+        instance = self.instance
+        for field, value in self.initial_data.items():
+            if field in self.FILE_FIELDS:
+                return True
+            if field in self.PASSWORD_FIELDS:
+                if value:
+                    return True
+                continue
+            if field in self.USER_FIELDS:
+                current = getattr(instance.user, field)
+            elif field in self.PROFILE_FIELDS:
+                current = getattr(instance, field)
+            elif field == 'phone_number':
+                # A blank phone number leaves the existing one untouched
+                if not value:
+                    continue
+                current = get_primary_mobile_number(instance.user)
+            else:
+                # Unknown fields are ignored by the serializer
+                continue
+            
+            if current is None or value is None:
+                if current is not value:
+                    return True
+            elif str(current) != str(value):
+                return True
+        return False
+    
     def validate(self, attrs):
         """Validate password change"""
         current_password = attrs.get('current_password', '')
@@ -124,9 +194,10 @@ class CurrentUserProfileUpdateSerializer(serializers.Serializer):
                     'error': 'New password must be at least 6 characters long.'
                 })
             
-            # Verify current password
+            # Verify current password. No setter is passed, so an outdated hash
+            # is not re-hashed and saved just before it gets replaced.
             user = self.context['request'].user
-            if not user.check_password(current_password):
+            if not check_password(current_password, user.password):
                 raise serializers.ValidationError({
                     'error': 'Current password is incorrect.'
                 })
@@ -214,8 +285,15 @@ class CurrentUserProfileUpdateSerializer(serializers.Serializer):
                     user=user,
                     is_primary=True
                 ).exclude(id=mobile.id).update(is_primary=False)
+            
+            # Drop any prefetched mobile numbers so the response reflects the change
+            getattr(user, '_prefetched_objects_cache', {}).pop('mobile_numbers', None)
         
         return instance
+    
+    def to_representation(self, instance):
+        """Render the saved profile with the read serializer's shape"""
+        return CurrentUserProfileSerializer(instance, context=self.context).data
 
 
 class ProfileCreateSerializer(serializers.Serializer):
@@ -317,65 +395,7 @@ class ProfileCreateSerializer(serializers.Serializer):
                 )
             
             return profile
-
-
-class ProfileListSerializer(serializers.ModelSerializer):
-    """Serializer for listing profiles"""
-    full_name = serializers.SerializerMethodField()
-    first_name = serializers.SerializerMethodField()
-    last_name = serializers.SerializerMethodField()
-    email = serializers.SerializerMethodField()
-    phone_number = serializers.SerializerMethodField()
-    username = serializers.CharField(source='user.username', read_only=True)
-    
-    class Meta:
-        model = Profile
-        fields = [
-            'id', 'username', 'email', 'first_name', 'last_name', 'full_name',
-            'phone_number', 'created_at'
-        ]
-        read_only_fields = ['id', 'created_at']
-    
-    def get_first_name(self, obj):
-        """Get first name from user"""
-        if obj.user:
-            return obj.user.first_name or ""
-        return ""
     
-    def get_last_name(self, obj):
-        """Get last name from user"""
-        if obj.user:
-            return obj.user.last_name or ""
-        return ""
-    
-    def get_full_name(self, obj):
-        """Get full name from user"""
-        if obj.user:
-            first_name = obj.user.first_name or ""
-            last_name = obj.user.last_name or ""
-            full_name = f"{first_name} {last_name}".strip()
-            if full_name:
-                return full_name
-            return obj.user.username or ""
-        return ""
-    
-    def get_email(self, obj):
-        """Get email from user"""
-        if obj.user:
-            return obj.user.email or ""
-        return ""
-    
-    def get_phone_number(self, obj):
-        """Get primary phone number"""
-        try:
-            mobile = MobileNumber.objects.filter(user=obj.user, is_primary=True).first()
-            if mobile:
-                return mobile.mobile_number
-            # If no primary, get first mobile number
-            mobile = MobileNumber.objects.filter(user=obj.user).first()
-            if mobile:
-                return mobile.mobile_number
-        except:
-            pass
-        return None
-
+    def to_representation(self, instance):
+        """Render the created profile with the read serializer's shape"""
+        return CurrentUserProfileSerializer(instance, context=self.context).data
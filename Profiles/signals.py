@@ -0,0 +1,30 @@
+"""
+Profile Signals
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Profile, MobileNumber
+from .cache import bump_profile_list_version
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def profile_changed(sender, instance, **kwargs):
+    """Mark cached list pages stale when a profile is added, edited or removed"""
+    bump_profile_list_version()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    """Mark cached list pages stale when user fields shown in the list change"""
+    # Logins only touch last_login, which the list does not render
+    if update_fields and set(update_fields) <= {'last_login', 'password'}:
+        return
+    bump_profile_list_version()
+
+
+@receiver([post_save, post_delete], sender=MobileNumber)
+def mobile_number_changed(sender, instance, **kwargs):
+    """Mark cached list pages stale when a user's mobile numbers change"""
+    bump_profile_list_version()
@@ -1,7 +1,7 @@
 """
 Profile Views
 """
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -10,16 +10,41 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 from rest_framework.pagination import PageNumberPagination
+from django.db import DatabaseError
 from django.db.models import Q
-from .models import Profile
+from .models import Profile, MobileNumber
+from .cache import get_cached_profile_list_page, set_cached_profile_list_page
 from .serializers import (
     CurrentUserProfileSerializer,
     CurrentUserProfileUpdateSerializer,
-    ProfileCreateSerializer,
-    ProfileListSerializer
+    ProfileCreateSerializer
 )
 
 
+# Shared swagger schema objects, built once at import
+ERROR_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'error': openapi.Schema(type=openapi.TYPE_STRING, description='Error message')
+    }
+)
+UNAUTHORIZED_RESPONSE = openapi.Response(description="Unauthorized", schema=ERROR_SCHEMA)
+VALIDATION_ERROR_RESPONSE = openapi.Response(description="Validation error", schema=ERROR_SCHEMA)
+
+
+def _get_or_create_profile(user):
+    """
+    Fetch the user's profile with the relations the profile serializer reads,
+    creating it if missing
+    """
+    queryset = CurrentUserProfileSerializer.setup_eager_loading(Profile.objects.all())
+    profile = queryset.filter(user=user).first()
+    if profile is None:
+        # Create profile if it doesn't exist
+        profile = Profile.objects.create(user=user)
+    return profile
+
+
 @swagger_auto_schema(
     method='get',
     operation_id='get_current_user_profile',
@@ -38,24 +63,8 @@ from .serializers import (
             description="User profile information",
             schema=CurrentUserProfileSerializer()
         ),
-        401: openapi.Response(
-            description="Unauthorized",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'error': openapi.Schema(type=openapi.TYPE_STRING, description='Error message')
-                }
-            )
-        ),
-        404: openapi.Response(
-            description="Profile not found",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'error': openapi.Schema(type=openapi.TYPE_STRING, description='Error message')
-                }
-            )
-        )
+        401: UNAUTHORIZED_RESPONSE,
+        404: openapi.Response(description="Profile not found", schema=ERROR_SCHEMA)
     }
 )
 @api_view(['GET'])
@@ -64,23 +73,14 @@ def get_current_user_profile(request):
     """
     Get current user profile endpoint
     """
-    user = request.user
-    
-    try:
-        profile = Profile.objects.get(user=user)
-    except Profile.DoesNotExist:
-        # Create profile if it doesn't exist
-        profile = Profile.objects.create(user=user)
+    profile = _get_or_create_profile(request.user)
     
     serializer = CurrentUserProfileSerializer(profile, context={'request': request})
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-@swagger_auto_schema(
-    method='put',
-    operation_id='update_current_user_profile',
-    operation_summary="Update Current User Profile",
-    operation_description="""
+# Shared by the PUT and PATCH schemas of update_current_user_profile
+UPDATE_PROFILE_DESCRIPTION = """
     Update the current authenticated user's profile information.
     
     **Features:**
@@ -109,92 +109,33 @@ def get_current_user_profile(request):
     **Request:**
     - All fields are optional (except password fields if changing password)
     - Use multipart/form-data for file uploads
-    """,
+    """
+
+UPDATE_PROFILE_RESPONSES = {
+    200: openapi.Response(
+        description="Profile updated successfully",
+        schema=CurrentUserProfileSerializer()
+    ),
+    400: VALIDATION_ERROR_RESPONSE,
+    401: UNAUTHORIZED_RESPONSE
+}
+
+
+@swagger_auto_schema(
+    method='put',
+    operation_id='update_current_user_profile',
+    operation_summary="Update Current User Profile",
+    operation_description=UPDATE_PROFILE_DESCRIPTION,
     tags=['Profile'],
-    responses={
-        200: openapi.Response(
-            description="Profile updated successfully",
-            schema=CurrentUserProfileSerializer()
-        ),
-        400: openapi.Response(
-            description="Validation error",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'error': openapi.Schema(type=openapi.TYPE_STRING, description='Error message')
-                }
-            )
-        ),
-        401: openapi.Response(
-            description="Unauthorized",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'error': openapi.Schema(type=openapi.TYPE_STRING, description='Error message')
-                }
-            )
-        )
-    }
+    responses=UPDATE_PROFILE_RESPONSES
 )
 @swagger_auto_schema(
     method='patch',
     operation_id='update_current_user_profile_patch',
     operation_summary="Update Current User Profile (PATCH)",
-    operation_description="""
-    Update the current authenticated user's profile information.
-    
-    **Features:**
-    - Update user fields (username, email, first_name, last_name)
-    - Update profile fields (photo, date_of_birth, gender, address, etc.)
-    - Update phone number (creates/updates primary mobile number)
-    - Change password (requires current_password, new_password, confirm_password)
-    - Supports file uploads (photo, aadhar_card, pan_card)
-    
-    **Password Change:**
-    - If any password field is provided, all password fields are required
-    - Current password must be correct
-    - New password must be at least 6 characters long
-    - New password and confirm password must match
-    
-    **File Uploads:**
-    - Photo: Image file (JPG, PNG, GIF)
-    - Aadhar Card: PDF or image file
-    - PAN Card: PDF or image file
-    
-    **Phone Number:**
-    - Updates or creates primary mobile number for the user
-    - If a primary mobile number already exists, it will be updated
-    - If no primary mobile number exists, a new one will be created
-    
-    **Request:**
-    - All fields are optional (except password fields if changing password)
-    - Use multipart/form-data for file uploads
-    """,
+    operation_description=UPDATE_PROFILE_DESCRIPTION,
     tags=['Profile'],
-    responses={
-        200: openapi.Response(
-            description="Profile updated successfully",
-            schema=CurrentUserProfileSerializer()
-        ),
-        400: openapi.Response(
-            description="Validation error",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'error': openapi.Schema(type=openapi.TYPE_STRING, description='Error message')
-                }
-            )
-        ),
-        401: openapi.Response(
-            description="Unauthorized",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'error': openapi.Schema(type=openapi.TYPE_STRING, description='Error message')
-                }
-            )
-        )
-    }
+    responses=UPDATE_PROFILE_RESPONSES
 )
 @api_view(['PUT', 'PATCH'])
 @permission_classes([IsAuthenticated])
@@ -204,13 +145,7 @@ def update_current_user_profile(request):
     Supports both PUT and PATCH methods
     Uses MultiPartParser and FormParser for file uploads
     """
-    user = request.user
-    
-    try:
-        profile = Profile.objects.get(user=user)
-    except Profile.DoesNotExist:
-        # Create profile if it doesn't exist
-        profile = Profile.objects.create(user=user)
+    profile = _get_or_create_profile(request.user)
     
     serializer = CurrentUserProfileUpdateSerializer(
         profile,
@@ -219,14 +154,18 @@ def update_current_user_profile(request):
         context={'request': request}
     )
     
+    # Nothing to change: skip validation queries and the save transaction
+    if not request.FILES and not serializer.has_changes():
+        response_serializer = CurrentUserProfileSerializer(profile, context={'request': request})
+        return Response(response_serializer.data, status=status.HTTP_200_OK)
+    
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     serializer.save()
     
     # Return updated profile
-    response_serializer = CurrentUserProfileSerializer(profile, context={'request': request})
-    return Response(response_serializer.data, status=status.HTTP_200_OK)
+    return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 @swagger_auto_schema(
@@ -271,24 +210,8 @@ def update_current_user_profile(request):
             description="Profile created successfully",
             schema=CurrentUserProfileSerializer()
         ),
-        400: openapi.Response(
-            description="Validation error",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'error': openapi.Schema(type=openapi.TYPE_STRING)
-                }
-            )
-        ),
-        401: openapi.Response(
-            description="Unauthorized",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'error': openapi.Schema(type=openapi.TYPE_STRING)
-                }
-            )
-        )
+        400: VALIDATION_ERROR_RESPONSE,
+        401: UNAUTHORIZED_RESPONSE
     }
 )
 @api_view(['POST'])
@@ -306,11 +229,10 @@ def create_profile(request):
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    profile = serializer.save()
+    serializer.save()
     
     # Return created profile
-    response_serializer = CurrentUserProfileSerializer(profile, context={'request': request})
-    return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
 class ProfilePagination(PageNumberPagination):
@@ -360,15 +282,7 @@ class ProfilePagination(PageNumberPagination):
                 }
             )
         ),
-        401: openapi.Response(
-            description="Unauthorized",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'error': openapi.Schema(type=openapi.TYPE_STRING)
-                }
-            )
-        )
+        401: UNAUTHORIZED_RESPONSE
     }
 )
 @api_view(['GET'])
@@ -376,30 +290,97 @@ class ProfilePagination(PageNumberPagination):
 def list_profiles(request):
     """
     List all profiles with search and pagination
+    Pages are cached briefly; a stale page is served if the database errors
     """
-    from Profiles.models import MobileNumber
+    cached_data, is_fresh = get_cached_profile_list_page(request)
+    if is_fresh:
+        return Response(cached_data, status=status.HTTP_200_OK)
     
-    queryset = Profile.objects.select_related('user').prefetch_related('user__mobile_numbers').all()
+    try:
+        response = _build_profile_list_response(request)
+    except DatabaseError:
+        if cached_data is None:
+            raise
+        response = Response(cached_data, status=status.HTTP_200_OK)
+        response['X-Cache'] = 'stale-fallback'
+        return response
+    
+    set_cached_profile_list_page(request, response.data)
+    return response
+
+
+def _build_profile_list_response(request):
+    """
+    Search, paginate and serialize profiles for list_profiles
+    """
+    queryset = Profile.objects.values(*PROFILE_LIST_VALUES)
     
     # Search functionality
     search_query = request.query_params.get('search', '').strip()
     if search_query:
+        # Match phone numbers through a subquery rather than joining
+        # mobile_numbers, which multiplies rows and forces a DISTINCT
+        matching_mobile_users = MobileNumber.objects.filter(
+            mobile_number__icontains=search_query
+        ).values('user_id')
         queryset = queryset.filter(
             Q(user__first_name__icontains=search_query) |
             Q(user__last_name__icontains=search_query) |
             Q(user__username__icontains=search_query) |
             Q(user__email__icontains=search_query) |
-            Q(user__mobile_numbers__mobile_number__icontains=search_query)
-        ).distinct()
+            Q(user_id__in=matching_mobile_users)
+        )
     
     # Pagination
     paginator = ProfilePagination()
     page = paginator.paginate_queryset(queryset, request)
     
-    if page is not None:
-        serializer = ProfileListSerializer(page, many=True, context={'request': request})
-        return paginator.get_paginated_response(serializer.data)
-    
-    # If no pagination
-    serializer = ProfileListSerializer(queryset, many=True, context={'request': request})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    # ProfilePagination always has a page size, so there is always a page
+    return paginator.get_paginated_response(_profile_list_rows(page))
+
+
+# Columns read by _profile_list_rows
+PROFILE_LIST_VALUES = (
+    'id', 'user_id', 'created_at',
+    'user__username', 'user__email', 'user__first_name', 'user__last_name',
+)
+
+_created_at_field = serializers.DateTimeField()
+
+
+def _profile_list_rows(values):
+    """
+    Build list_profiles rows from a page of Profile.values() dicts without
+    instantiating models or serializers; phone numbers take one query per page.
+    """
+    # Primary mobile number per user, falling back to their first one
+    phone_numbers = {}
+    primary_users = set()
+    mobiles = MobileNumber.objects.filter(
+        user_id__in={row['user_id'] for row in values}
+    ).order_by('id').values_list('user_id', 'mobile_number', 'is_primary')
+    for user_id, mobile_number, is_primary in mobiles:
+        if user_id in primary_users:
+            continue
+        if is_primary:
+            phone_numbers[user_id] = mobile_number
+            primary_users.add(user_id)
+        else:
+            phone_numbers.setdefault(user_id, mobile_number)
+    
+    rows = []
+    for row in values:
+        first_name = row['user__first_name'] or ""
+        last_name = row['user__last_name'] or ""
+        username = row['user__username']
+        rows.append({
+            'id': row['id'],
+            'username': username,
+            'email': row['user__email'] or "",
+            'first_name': first_name,
+            'last_name': last_name,
+            'full_name': f"{first_name} {last_name}".strip() or username or "",
+            'phone_number': phone_numbers.get(row['user_id']),
+            'created_at': _created_at_field.to_representation(row['created_at']),
+        })
+    return rows
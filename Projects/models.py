@@ -2,13 +2,17 @@ from django.db import models
 from django.contrib.auth.models import User
 
 
+# Module level so Project.Meta can build its status constraint from the same choices
+class ProjectStatus(models.TextChoices):
+    PLANNED = "Planned", "Planned"
+    IN_PROGRESS = "In Progress", "In Progress"
+    ON_HOLD = "On Hold", "On Hold"
+    COMPLETED = "Completed", "Completed"
+    CANCELED = "Canceled", "Canceled"
+
+
 class Project(models.Model):
-    class Status(models.TextChoices):
-        PLANNED = "Planned", "Planned"
-        IN_PROGRESS = "In Progress", "In Progress"
-        ON_HOLD = "On Hold", "On Hold"
-        COMPLETED = "Completed", "Completed"
-        CANCELED = "Canceled", "Canceled"
+    Status = ProjectStatus
 
     tender = models.ForeignKey("Tenders.Tender", on_delete=models.CASCADE, related_name="projects")
     name = models.CharField(max_length=255)
@@ -22,6 +26,24 @@ class Project(models.Model):
     updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, related_name="projects_updated", blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'start_date'], name='proj_status_start_idx'),
+            models.Index(fields=['-created_at', '-id'], name='proj_created_id_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='proj_status_created_idx'),
+            models.Index(
+                fields=['start_date', 'end_date'],
+                name='proj_active_dates_idx',
+                condition=models.Q(status__in=[ProjectStatus.PLANNED.value, ProjectStatus.IN_PROGRESS.value]),
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(status__in=ProjectStatus.values),
+                name='proj_status_valid',
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -61,7 +61,18 @@ class ProjectCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
     
     def update(self, instance, validated_data):
+        """Save only the fields whose values changed; skip the write if none did"""
+        changed = [
+            field for field, value in validated_data.items()
+            if getattr(instance, field) != value
+        ]
+        if not changed:
+            return instance
+        
+        for field in changed:
+            setattr(instance, field, validated_data[field])
         user = self.context['request'].user
-        validated_data['updated_by'] = user if user.is_authenticated else None
-        return super().update(instance, validated_data)
+        instance.updated_by = user if user.is_authenticated else None
+        instance.save(update_fields=changed + ['updated_by', 'updated_at'])
+        return instance
 
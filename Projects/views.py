@@ -1,10 +1,12 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
-from django.db.models import Q
+from django.db.models import Count, Q
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+from Tenders.models import Tender
 from .models import Project
 from .serializers import (
     ProjectListSerializer,
@@ -14,11 +16,19 @@ from .serializers import (
 )
 
 
+class ProjectCursorPagination(CursorPagination):
+    """Keyset pagination for the project list, avoiding a COUNT(*) per page"""
+    page_size = 20
+    ordering = ('-created_at', '-id')
+
+
 class ProjectViewSet(viewsets.ModelViewSet):
     """
     Project Management APIs
     """
-    queryset = Project.objects.select_related('tender', 'created_by', 'updated_by').all()
+    # created_by/updated_by are rendered as primary keys, so they need no join
+    queryset = Project.objects.select_related('tender').all()
+    pagination_class = ProjectCursorPagination
     
     def get_serializer_class(self):
         if self.action in ['list']:
@@ -30,21 +40,40 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = super().get_queryset()
         
-        # Search by project name or tender name
-        search = self.request.query_params.get('search', None)
-        if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) |
-                Q(tender__name__icontains=search) |
-                Q(tender__reference_number__icontains=search)
+        # The list only renders these columns
+        if self.action == 'list':
+            queryset = queryset.only(
+                'id', 'name', 'tender_id', 'tender__name',
+                'start_date', 'end_date', 'status', 'created_at'
             )
         
+        params = self.request.query_params
+        
+        # Search by project name or tender name; a blank ?search= means no filter
+        search = (params.get('search') or '').strip()
+        if search:
+            queryset = queryset.filter(self._search_filter(search))
+        
         # Filter by status
-        status_filter = self.request.query_params.get('status', None)
+        status_filter = params.get('status')
         if status_filter:
             queryset = queryset.filter(status=status_filter)
         
-        return queryset.order_by('-created_at')
+        # Ordering for the list comes from ProjectCursorPagination
+        return queryset
+    
+    @staticmethod
+    def _search_filter(search):
+        """
+        Match on project name, or on tender name/reference number through a
+        subquery so the tender match is evaluated once against the tender
+        table rather than OR'd into every joined project row
+        """
+        matching_tenders = Tender.objects.filter(
+            Q(name__icontains=search) |
+            Q(reference_number__icontains=search)
+        ).values('id')
+        return Q(name__icontains=search) | Q(tender_id__in=matching_tenders)
     
     @swagger_auto_schema(
         operation_id='project_list',
@@ -67,7 +96,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
         - status (optional): Filter by project status
         
         **Pagination:**
-        Results are paginated (20 items per page by default) and sorted by creation date (newest first).
+        Results are cursor paginated (20 items per page) and sorted by creation date (newest first).
+        Follow the `next` / `previous` links to move between pages.
         """,
         tags=['Project Management'],
         manual_parameters=[
@@ -92,7 +122,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 schema=openapi.Schema(
                     type=openapi.TYPE_OBJECT,
                     properties={
-                        'count': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'next': openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_URI, x_nullable=True),
+                        'previous': openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_URI, x_nullable=True),
                         'results': openapi.Schema(
                             type=openapi.TYPE_ARRAY,
                             items=openapi.Schema(type=openapi.TYPE_OBJECT)
@@ -281,24 +312,15 @@ class ProjectViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], url_path='statistics')
     def statistics(self, request):
         """Get project management statistics for dashboard"""
-        # Total projects
-        total_projects = Project.objects.count()
-        
-        # Projects by status
-        planned_projects = Project.objects.filter(status=Project.Status.PLANNED).count()
-        in_progress_projects = Project.objects.filter(status=Project.Status.IN_PROGRESS).count()
-        completed_projects = Project.objects.filter(status=Project.Status.COMPLETED).count()
-        on_hold_projects = Project.objects.filter(status=Project.Status.ON_HOLD).count()
-        canceled_projects = Project.objects.filter(status=Project.Status.CANCELED).count()
-        
-        data = {
-            'total_projects': total_projects,
-            'planned_projects': planned_projects,
-            'in_progress_projects': in_progress_projects,
-            'completed_projects': completed_projects,
-            'on_hold_projects': on_hold_projects,
-            'canceled_projects': canceled_projects
-        }
+        # Total and per-status counts in a single query
+        data = Project.objects.aggregate(
+            total_projects=Count('id'),
+            planned_projects=Count('id', filter=Q(status=Project.Status.PLANNED)),
+            in_progress_projects=Count('id', filter=Q(status=Project.Status.IN_PROGRESS)),
+            completed_projects=Count('id', filter=Q(status=Project.Status.COMPLETED)),
+            on_hold_projects=Count('id', filter=Q(status=Project.Status.ON_HOLD)),
+            canceled_projects=Count('id', filter=Q(status=Project.Status.CANCELED)),
+        )
         
         serializer = ProjectStatisticsSerializer(data)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,181 @@
+"""
+Shared schedule table and helpers for the Scheduler setup commands.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from django_celery_beat.models import PeriodicTask, CrontabSchedule, IntervalSchedule
+
+
+# Each entry describes one periodic task and the schedule it runs on.
+# crontab day_of_week: 0=Monday, 6=Sunday
+SCHEDULES = [
+    {
+        'key': 'absent_marking',
+        'name': 'Mark Absent Employees',
+        'task': 'Scheduler.tasks.mark_absent_employees',
+        'label': 'Daily at 11:40 PM (Asia/Kolkata), Monday-Saturday',
+        'description': 'Mark employees as absent who didn\'t mark attendance for the day. Runs daily at 11:40 PM (Asia/Kolkata), Monday-Saturday.',
+        'schedule': {
+            'kind': 'crontab',
+            'minute': '40',
+            'hour': '23',
+            'day_of_week': '0,1,2,3,4,5',  # Monday to Saturday (exclude Sunday)
+            'day_of_month': '*',
+            'month_of_year': '*',
+            'timezone': 'Asia/Kolkata',
+        },
+    },
+    {
+        'key': 'amc_billing',
+        'name': 'Generate AMC Billing Records',
+        'task': 'Scheduler.tasks.generate_amc_billing',
+        'label': 'Daily at 12:00 AM (Asia/Kolkata)',
+        'description': 'Generate AMC billing records automatically based on billing cycle. Runs daily at 12:00 AM (Asia/Kolkata) to check for AMCs that need new billing records generated.',
+        'schedule': {
+            'kind': 'crontab',
+            'minute': '0',
+            'hour': '0',
+            'day_of_week': '*',
+            'day_of_month': '*',
+            'month_of_year': '*',
+            'timezone': 'Asia/Kolkata',
+        },
+    },
+    {
+        'key': 'notifications',
+        'name': 'Send Scheduled Notifications',
+        'task': 'Scheduler.tasks.send_scheduled_notifications',
+        'label': 'Every 5 minutes',
+        'description': 'Check for scheduled notifications that are due and send them. Runs every 5 minutes.',
+        'schedule': {
+            'kind': 'interval',
+            'every': 5,
+            'period': IntervalSchedule.MINUTES,
+        },
+    },
+    {
+        'key': 'payroll',
+        'name': 'Generate Monthly Payroll',
+        'task': 'Scheduler.tasks.generate_monthly_payroll',
+        'label': 'Days 28-31 at 11:00 PM (Asia/Kolkata), last day of the month only',
+        'description': 'Generate monthly payroll records for all employees on the last day of each month at 11:00 PM (Asia/Kolkata)',
+        'schedule': {
+            'kind': 'crontab',
+            'minute': '0',
+            'hour': '23',
+            'day_of_week': '*',
+            'day_of_month': '28-31',  # Every month ends on one of these; the task skips the others
+            'month_of_year': '*',
+            'timezone': 'Asia/Kolkata',
+        },
+    },
+    {
+        'key': 'tender_auto_close',
+        'name': 'Auto-Close Awarded Tenders',
+        'task': 'Scheduler.tasks.auto_close_awarded_tenders',
+        'label': 'Daily at 1:00 AM (Asia/Kolkata)',
+        'description': 'Automatically close tenders with status "Awarded" after their end_date has passed. Runs daily at 1:00 AM (Asia/Kolkata).',
+        'schedule': {
+            'kind': 'crontab',
+            'minute': '0',
+            'hour': '1',
+            'day_of_week': '*',
+            'day_of_month': '*',
+            'month_of_year': '*',
+            'timezone': 'Asia/Kolkata',
+        },
+    },
+]
+
+SCHEDULE_MODELS = {
+    'crontab': CrontabSchedule,
+    'interval': IntervalSchedule,
+}
+
+
+def schedule_key(spec):
+    """Hashable (kind, fields) key identifying the schedule a spec runs on"""
+    schedule_kwargs = dict(spec['schedule'])
+    kind = schedule_kwargs.pop('kind')
+    return kind, tuple(sorted(schedule_kwargs.items()))
+
+
+def get_schedule_id(spec, schedule_ids):
+    """
+    Return (schedule_id, created) for the schedule a spec runs on.
+    schedule_ids maps schedule_key() to primary keys resolved earlier in the same
+    command run, so tasks sharing a cadence reuse the id instead of querying again.
+    """
+    key = schedule_key(spec)
+    if key in schedule_ids:
+        return schedule_ids[key], False
+
+    kind, schedule_kwargs = key
+    schedule, created = SCHEDULE_MODELS[kind].objects.get_or_create(**dict(schedule_kwargs))
+    schedule_ids[key] = schedule.pk
+    return schedule.pk, created
+
+
+def _normalize(values):
+    """Compare schedule columns as strings; timezone columns come back as tz objects"""
+    return tuple(str(value) for value in values)
+
+
+def prefetch_schedule_ids(specs, schedule_ids):
+    """
+    Resolve the schedules for many specs at once into schedule_ids: one SELECT
+    per schedule kind for the rows that already exist and one bulk INSERT for the rest.
+    """
+    wanted = {}
+    for spec in specs:
+        key = schedule_key(spec)
+        if key not in schedule_ids:
+            wanted.setdefault(key[0], set()).add(key[1])
+
+    for kind, schedules in wanted.items():
+        model = SCHEDULE_MODELS[kind]
+        field_names = [name for name, _ in next(iter(schedules))]
+        lookup = {_normalize(value for _, value in fields): fields for fields in schedules}
+
+        existing = model.objects.filter(reduce(or_, (Q(**dict(fields)) for fields in schedules)))
+        for row in existing.values('pk', *field_names):
+            fields = lookup.pop(_normalize(row[name] for name in field_names), None)
+            if fields is not None:
+                schedule_ids[(kind, fields)] = row['pk']
+
+        missing = list(lookup.values())
+        created = model.objects.bulk_create([model(**dict(fields)) for fields in missing])
+        for fields, schedule in zip(missing, created):
+            schedule_ids[(kind, fields)] = schedule.pk
+
+
+def ensure_periodic_task(spec, schedule_ids):
+    """
+    Create or update the schedule and periodic task described by spec.
+    Returns (schedule_created, task_status) where task_status is one of
+    'created', 'updated' or 'unchanged'.
+    """
+    kind = spec['schedule']['kind']
+    schedule_id, schedule_created = get_schedule_id(spec, schedule_ids)
+
+    fields = {
+        'task': spec['task'],
+        f'{kind}_id': schedule_id,
+        'enabled': True,
+        'description': spec['description'],
+    }
+    tasks = PeriodicTask.objects.filter(name=spec['name'])
+    current = tasks.values(*fields).first()
+
+    if current is None:
+        PeriodicTask.objects.create(name=spec['name'], **fields)
+        return schedule_created, 'created'
+
+    # Re-running setup is the common case; skip the write when nothing differs
+    if current == fields:
+        return schedule_created, 'unchanged'
+
+    tasks.update(**fields)
+    return schedule_created, 'updated'
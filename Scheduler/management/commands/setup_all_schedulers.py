@@ -0,0 +1,65 @@
+"""
+Management command to set up every Scheduler periodic task with one bulk upsert.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django_celery_beat.models import PeriodicTask, PeriodicTasks
+
+from ._scheduler_utils import SCHEDULES, get_schedule_id, prefetch_schedule_ids
+
+
+# PeriodicTask columns this command owns and compares against the schedule table
+MANAGED_FIELDS = ('task', 'enabled', 'description', 'crontab_id', 'interval_id')
+
+
+class Command(BaseCommand):
+    help = 'Set up all Scheduler periodic tasks in a single bulk insert/update'
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        # Look up (or create) every schedule in one batch per schedule kind;
+        # the ids are kept for this run only
+        schedule_ids = {}
+        prefetch_schedule_ids(SCHEDULES, schedule_ids)
+
+        wanted = {
+            spec['name']: {
+                'task': spec['task'],
+                'enabled': True,
+                'description': spec['description'],
+                'crontab_id': None,
+                'interval_id': None,
+                f"{spec['schedule']['kind']}_id": get_schedule_id(spec, schedule_ids)[0],
+            }
+            for spec in SCHEDULES
+        }
+        current = {
+            row.pop('name'): row
+            for row in PeriodicTask.objects.filter(name__in=wanted).values('name', *MANAGED_FIELDS)
+        }
+        # Only tasks that are missing or differ are written
+        tasks = [
+            PeriodicTask(name=name, **fields)
+            for name, fields in wanted.items()
+            if current.get(name) != fields
+        ]
+
+        if tasks:
+            # INSERT ... ON CONFLICT (name) DO UPDATE for every changed task at once
+            PeriodicTask.objects.bulk_create(
+                tasks,
+                update_conflicts=True,
+                unique_fields=['name'],
+                update_fields=['task', 'crontab', 'interval', 'enabled', 'description', 'date_changed'],
+            )
+            # bulk_create skips PeriodicTask.save(), so tell beat to reload
+            PeriodicTasks.update_changed()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(tasks)} periodic task(s) created or updated\n'
+            + '\n'.join(f'{spec["name"]}: {spec["label"]} -> {spec["task"]}' for spec in SCHEDULES)
+            + '\n\nPeriodic task setup complete!\n'
+            + '\nTo start the Celery Beat scheduler, run:\n'
+            + 'celery -A API beat -l info'
+        ))
+
@@ -2,22 +2,73 @@
 Celery tasks for the Scheduler app.
 """
 from celery import shared_task
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, Prefetch, Q, Sum
 from django.utils import timezone
 from datetime import date, timedelta
 from calendar import monthrange
+from collections import defaultdict
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+from dateutil.relativedelta import relativedelta
 import logging
+import re
+import time
 
-from HR.models import Employee, PayrollRecord
+from HR.models import Employee, PayrollRecord, Attendance
 from AMC.models import AMC, AMCBilling
 from Tenders.models import Tender, TenderDeposit
-from Notifications.models import Notification
-from Notifications.utils import send_notification_to_owners
+from Notifications.models import Notification, EmailTemplate
+from Notifications.cache import get_email_template_content
+from Notifications.utils import send_fcm_push_notification, send_notification_to_owners
 from django.contrib.auth.models import User
 
 logger = logging.getLogger(__name__)
 
+KOLKATA_TZ = ZoneInfo('Asia/Kolkata')
+
+# Seconds a worker process reuses its list of superadmins before querying again
+SUPERADMIN_CACHE_TTL = 300
+
+# Superadmins cached for this process; membership rarely changes between task runs
+_superadmin_cache = {'users': [], 'expires_at': 0}
+
+# Rows per multi-row INSERT when tasks bulk-create billing records and notifications
+BULK_CREATE_BATCH_SIZE = 500
+
+# Rows fetched per round-trip when streaming large querysets with .iterator()
+ITERATOR_CHUNK_SIZE = 1000
+
+# Number of billing periods per year for each AMC billing cycle
+BILLING_PERIODS_PER_YEAR = {
+    AMC.BillingCycle.MONTHLY: 12,
+    AMC.BillingCycle.QUARTERLY: 4,
+    AMC.BillingCycle.HALF_YEARLY: 2,
+    AMC.BillingCycle.YEARLY: 1,
+}
+
+# Length of one billing period in months for each AMC billing cycle
+BILLING_PERIOD_MONTHS = {
+    AMC.BillingCycle.MONTHLY: 1,
+    AMC.BillingCycle.QUARTERLY: 3,
+    AMC.BillingCycle.HALF_YEARLY: 6,
+    AMC.BillingCycle.YEARLY: 12,
+}
+
+
+def _get_superadmins():
+    """
+    Return the superadmin users, ordered by id, cached per worker process for
+    SUPERADMIN_CACHE_TTL seconds. The first one is used as the system user.
+    """
+    now = time.monotonic()
+    if now >= _superadmin_cache['expires_at']:
+        _superadmin_cache['users'] = list(User.objects.filter(is_superuser=True).order_by('id'))
+        _superadmin_cache['expires_at'] = now + SUPERADMIN_CACHE_TTL
+    return _superadmin_cache['users']
+
 
 @shared_task(bind=True, name='Scheduler.tasks.generate_monthly_payroll')
 def generate_monthly_payroll(self):
@@ -30,16 +81,12 @@ def generate_monthly_payroll(self):
     The task:
     1. Checks if today is the last day of the month
     2. Ensures idempotency (doesn't create duplicate records)
-    3. Creates payroll records for all employees in a transaction
+    3. Creates payroll records for all employees in batched inserts within a transaction
     4. Calculates working days and days present based on attendance records
     """
     try:
         # Get current date in Asia/Kolkata timezone
-        from django.utils import timezone as tz
-        import pytz
-        
-        kolkata_tz = pytz.timezone('Asia/Kolkata')
-        now = tz.now().astimezone(kolkata_tz)
+        now = timezone.now().astimezone(KOLKATA_TZ)
         today = now.date()
         
         # Check if today is the last day of the month
@@ -59,7 +106,8 @@ def generate_monthly_payroll(self):
         period_to = date(today.year, today.month, last_day)
         
         # Get system user for created_by field (or create a default admin user)
-        system_user = User.objects.filter(is_superuser=True).first()
+        admins = _get_superadmins()
+        system_user = admins[0] if admins else None
         if not system_user:
             logger.warning("No superuser found. Payroll records will have null created_by.")
         
@@ -67,10 +115,68 @@ def generate_monthly_payroll(self):
         updated_count = 0
         skipped_count = 0
         
-        # Get all active employees
-        employees = Employee.objects.select_related('profile', 'profile__user').all()
+        # Get all active employees; only the columns payroll needs, streamed in chunks
+        employees = Employee.objects.only('id', 'employee_code', 'monthly_salary').iterator(
+            chunk_size=ITERATOR_CHUNK_SIZE
+        )
+        total_employees = 0
+        
+        # Employees that already have a payroll record for this month; a plain date
+        # range (rather than __year/__month extracts) can use an index on period_from
+        existing_employee_ids = set(PayrollRecord.objects.filter(
+            period_from__gte=period_from,
+            period_from__lte=period_to
+        ).values_list('employee_id', flat=True))
+        
+        # Calculate working days (excluding weekends and holidays); the same for every employee
+        # This is a simplified calculation - you may want to enhance this
+        # based on your business logic (e.g., exclude holidays from HolidayCalander)
+        working_days = _calculate_working_days(period_from, period_to)
+        
+        # Days present for every employee in one grouped query
+        days_present_by_employee = _calculate_days_present_by_employee(period_from, period_to)
+        
+        payrolls_to_create = []
+        for employee in employees:
+            total_employees += 1
+            try:
+                if employee.id in existing_employee_ids:
+                    logger.info(f"Payroll record already exists for employee {employee.employee_code} "
+                              f"for {today.year}-{today.month:02d}. Skipping.")
+                    skipped_count += 1
+                    continue
+                
+                # Calculate days present from attendance records
+                days_present = days_present_by_employee.get(employee.id, 0)
+                
+                # Calculate net amount (simplified - you may want to add deductions, allowances, etc.)
+                # Basic calculation: (monthly_salary / working_days) * days_present
+                if working_days > 0:
+                    daily_rate = employee.monthly_salary / working_days
+                    net_amount = daily_rate * days_present
+                else:
+                    net_amount = 0
+                
+                # Round to 2 decimal places
+                net_amount = round(net_amount, 2)
+                
+                payrolls_to_create.append(PayrollRecord(
+                    employee=employee,
+                    payroll_status=PayrollRecord.PayrollStatus.PENDING,
+                    period_from=period_from,
+                    period_to=period_to,
+                    working_days=working_days,
+                    days_present=days_present,
+                    net_amount=net_amount,
+                    notes=f'Auto-generated payroll for {today.year}-{today.month:02d}',
+                    created_by=system_user
+                ))
+                
+            except Exception as e:
+                logger.error(f"Error generating payroll for employee {employee.employee_code}: {str(e)}")
+                continue
         
-        if not employees.exists():
+        if total_employees == 0:
             logger.warning("No employees found. Skipping payroll generation.")
             return {
                 'status': 'skipped',
@@ -78,60 +184,11 @@ def generate_monthly_payroll(self):
                 'date': str(today)
             }
         
+        # Insert all new payroll records in multi-row batches
         with transaction.atomic():
-            for employee in employees:
-                try:
-                    # Check if payroll record already exists for this employee and month
-                    existing_payroll = PayrollRecord.objects.filter(
-                        employee=employee,
-                        period_from__year=today.year,
-                        period_from__month=today.month
-                    ).first()
-                    
-                    if existing_payroll:
-                        logger.info(f"Payroll record already exists for employee {employee.employee_code} "
-                                  f"for {today.year}-{today.month:02d}. Skipping.")
-                        skipped_count += 1
-                        continue
-                    
-                    # Calculate working days (excluding weekends and holidays)
-                    # This is a simplified calculation - you may want to enhance this
-                    # based on your business logic (e.g., exclude holidays from HolidayCalander)
-                    working_days = _calculate_working_days(period_from, period_to)
-                    
-                    # Calculate days present from attendance records
-                    days_present = _calculate_days_present(employee, period_from, period_to)
-                    
-                    # Calculate net amount (simplified - you may want to add deductions, allowances, etc.)
-                    # Basic calculation: (monthly_salary / working_days) * days_present
-                    if working_days > 0:
-                        daily_rate = employee.monthly_salary / working_days
-                        net_amount = daily_rate * days_present
-                    else:
-                        net_amount = 0
-                    
-                    # Round to 2 decimal places
-                    net_amount = round(net_amount, 2)
-                    
-                    # Create payroll record
-                    payroll = PayrollRecord.objects.create(
-                        employee=employee,
-                        payroll_status=PayrollRecord.PayrollStatus.PENDING,
-                        period_from=period_from,
-                        period_to=period_to,
-                        working_days=working_days,
-                        days_present=days_present,
-                        net_amount=net_amount,
-                        notes=f'Auto-generated payroll for {today.year}-{today.month:02d}',
-                        created_by=system_user
-                    )
-                    
-                    created_count += 1
-                    logger.info(f"Created payroll record {payroll.id} for employee {employee.employee_code}")
-                    
-                except Exception as e:
-                    logger.error(f"Error generating payroll for employee {employee.employee_code}: {str(e)}")
-                    continue
+            PayrollRecord.objects.bulk_create(payrolls_to_create, batch_size=settings.PAYROLL_BULK_BATCH_SIZE)
+        created_count = len(payrolls_to_create)
+        logger.info(f"Created {created_count} payroll record(s) for {today.year}-{today.month:02d}")
         
         result = {
             'status': 'success',
@@ -141,7 +198,7 @@ def generate_monthly_payroll(self):
             'created_count': created_count,
             'updated_count': updated_count,
             'skipped_count': skipped_count,
-            'total_employees': employees.count()
+            'total_employees': total_employees
         }
         
         # Notify owners when payroll is generated
@@ -150,7 +207,8 @@ def generate_monthly_payroll(self):
                 title="Monthly Payroll Generated",
                 message=f"Monthly payroll records have been generated for {created_count} employee(s) for {today.year}-{today.month:02d}",
                 notification_type="Payroll",
-                created_by=system_user
+                created_by=system_user,
+                owners=admins
             )
         
         logger.info(f"Monthly payroll generation completed: {result}")
@@ -173,41 +231,39 @@ def _calculate_working_days(period_from, period_to):
     Returns:
         int: Number of working days
     """
-    working_days = 0
-    current_date = period_from
+    total_days = (period_to - period_from).days + 1
+    if total_days <= 0:
+        return 0
     
-    while current_date <= period_to:
-        # Check if it's not a weekend (Monday=0, Sunday=6)
-        if current_date.weekday() < 5:  # Monday to Friday
-            working_days += 1
-        current_date += timedelta(days=1)
+    # Every full week has 5 working days; count the leftover days individually
+    full_weeks, extra_days = divmod(total_days, 7)
+    start_weekday = period_from.weekday()  # Monday=0, Sunday=6
+    extra_working_days = sum(1 for offset in range(extra_days) if (start_weekday + offset) % 7 < 5)
     
-    return working_days
+    return full_weeks * 5 + extra_working_days
 
 
-def _calculate_days_present(employee, period_from, period_to):
+def _calculate_days_present_by_employee(period_from, period_to):
     """
-    Calculate days present for an employee based on attendance records.
+    Calculate days present for all employees based on attendance records.
     
     Args:
-        employee: Employee instance
         period_from: Start date
         period_to: End date
     
     Returns:
-        int: Number of days present
+        dict: Number of days present keyed by employee id (employees
+        without attendance are absent from the dict)
     """
-    from HR.models import Attendance
-    
-    # Count attendance records with status "Present" or "Half-Day"
-    days_present = Attendance.objects.filter(
-        employee=employee,
-        attendance_date__gte=period_from,
-        attendance_date__lte=period_to,
-        attendance_status__in=[Attendance.AttendanceStatus.PRESENT, Attendance.AttendanceStatus.HALF_DAY]
-    ).count()
     
-    return days_present
+    # Count attendance records with status "Present" or "Half-Day", grouped by employee
+    return dict(
+        Attendance.objects.filter(
+            attendance_date__gte=period_from,
+            attendance_date__lte=period_to,
+            attendance_status__in=[Attendance.AttendanceStatus.PRESENT, Attendance.AttendanceStatus.HALF_DAY]
+        ).values('employee_id').annotate(days_present=Count('id')).values_list('employee_id', 'days_present')
+    )
 
 
 @shared_task(bind=True, name='Scheduler.tasks.generate_amc_billing')
@@ -226,22 +282,24 @@ def generate_amc_billing(self):
     """
     try:
         # Get current date in Asia/Kolkata timezone
-        from django.utils import timezone as tz
-        import pytz
-        
-        kolkata_tz = pytz.timezone('Asia/Kolkata')
-        now = tz.now().astimezone(kolkata_tz)
+        now = timezone.now().astimezone(KOLKATA_TZ)
         today = now.date()
         
         logger.info(f"Starting AMC billing generation for {today}")
         
         # Get system user for created_by field
-        system_user = User.objects.filter(is_superuser=True).first()
+        admins = _get_superadmins()
+        system_user = admins[0] if admins else None
         if not system_user:
             logger.warning("No superuser found. Billing records will have null created_by.")
         
         # Get all active AMCs
-        active_amcs = AMC.objects.filter(status=AMC.Status.ACTIVE)
+        active_amcs = AMC.objects.filter(status=AMC.Status.ACTIVE).select_related(
+            'client__profile__user'
+        ).prefetch_related(
+            # Already billed periods for every AMC in one query
+            Prefetch('billings', queryset=AMCBilling.objects.only('id', 'amc_id', 'period_from', 'period_to'))
+        )
         
         if not active_amcs.exists():
             logger.info("No active AMCs found. Skipping billing generation.")
@@ -251,110 +309,96 @@ def generate_amc_billing(self):
                 'date': str(today)
             }
         
-        total_bills_created = 0
-        total_notifications_sent = 0
         amcs_processed = []
+        bills_to_create = []
+        # Bill numbers already in use, plus those handed out in this run
+        taken_bill_numbers = set()
         
-        with transaction.atomic():
-            for amc in active_amcs:
-                try:
-                    # Check if AMC is still valid (end_date hasn't passed)
-                    if amc.end_date < today:
-                        logger.info(f"AMC {amc.amc_number} has expired (end_date: {amc.end_date}). Skipping.")
-                        continue
-                    
-                    # Calculate billing periods and amounts
-                    billing_periods = _calculate_billing_periods(amc, today)
-                    
-                    if not billing_periods:
-                        logger.info(f"No billing periods to generate for AMC {amc.amc_number}")
-                        continue
-                    
-                    bills_created_for_amc = 0
-                    
-                    for period in billing_periods:
-                        period_from = period['period_from']
-                        period_to = period['period_to']
-                        amount = period['amount']
-                        
-                        # Check if billing record already exists for this period
-                        existing_billing = AMCBilling.objects.filter(
-                            amc=amc,
-                            period_from=period_from,
-                            period_to=period_to
-                        ).first()
-                        
-                        if existing_billing:
-                            logger.info(f"Billing record already exists for AMC {amc.amc_number} "
-                                      f"period {period_from} to {period_to}. Skipping.")
-                            continue
-                        
-                        # Generate bill number
-                        bill_number = _generate_bill_number(amc, period_from)
-                        
-                        # Create billing record
-                        billing = AMCBilling.objects.create(
-                            amc=amc,
-                            bill_number=bill_number,
-                            bill_date=today,
-                            period_from=period_from,
-                            period_to=period_to,
-                            amount=amount,
-                            paid=False,
-                            created_by=system_user
-                        )
-                        
-                        bills_created_for_amc += 1
-                        total_bills_created += 1
-                        
-                        logger.info(f"Created billing record {billing.bill_number} for AMC {amc.amc_number} "
-                                  f"period {period_from} to {period_to}, amount: {amount}")
-                    
-                    if bills_created_for_amc > 0:
-                        amcs_processed.append({
-                            'amc_number': amc.amc_number,
-                            'client_name': _get_client_name(amc.client),
-                            'bills_created': bills_created_for_amc
-                        })
+        for amc in active_amcs:
+            try:
+                # Check if AMC is still valid (end_date hasn't passed)
+                if amc.end_date < today:
+                    logger.info(f"AMC {amc.amc_number} has expired (end_date: {amc.end_date}). Skipping.")
+                    continue
                 
-                except Exception as e:
-                    logger.error(f"Error processing AMC {amc.amc_number}: {str(e)}", exc_info=True)
+                # Calculate billing periods and amounts (already billed periods are excluded)
+                billing_periods = _calculate_billing_periods(amc, today)
+                
+                if not billing_periods:
+                    logger.info(f"No billing periods to generate for AMC {amc.amc_number}")
                     continue
-            
-            # Send notifications to all superadmins (owners) if bills were created
-            if total_bills_created > 0:
-                admins = User.objects.filter(is_superuser=True).distinct()
                 
-                notification_count = 0
-                for admin in admins:
-                    try:
-                        notification_title = f"New AMC Billing Records Generated"
-                        notification_message = (
-                            f"{total_bills_created} new AMC billing record(s) have been generated automatically.\n\n"
-                            f"AMCs processed:\n"
-                        )
-                        
-                        for amc_info in amcs_processed:
-                            notification_message += (
-                                f"- AMC {amc_info['amc_number']} ({amc_info['client_name']}): "
-                                f"{amc_info['bills_created']} bill(s)\n"
-                            )
-                        
-                        Notification.objects.create(
-                            recipient=admin,
-                            title=notification_title,
-                            message=notification_message,
-                            type=Notification.Type.AMC,
-                            channel=Notification.Channel.IN_APP,
-                            created_by=system_user
-                        )
-                        notification_count += 1
-                    except Exception as e:
-                        logger.error(f"Error creating notification for admin {admin.username}: {str(e)}")
-                        continue
+                # Every number this AMC's bills could collide with starts with its prefix
+                taken_bill_numbers.update(AMCBilling.objects.filter(
+                    bill_number__startswith=f"AMC-{amc.amc_number}-"
+                ).values_list('bill_number', flat=True))
+                
+                amc_bills = []
+                for period in billing_periods:
+                    amc_bills.append(AMCBilling(
+                        amc=amc,
+                        bill_number=_generate_bill_number(amc, period['period_from'], taken_bill_numbers),
+                        bill_date=today,
+                        period_from=period['period_from'],
+                        period_to=period['period_to'],
+                        amount=period['amount'],
+                        paid=False,
+                        created_by=system_user
+                    ))
                 
-                total_notifications_sent = notification_count
-                logger.info(f"Sent {total_notifications_sent} notifications to superadmins (owners) about new billing records")
+                bills_to_create.extend(amc_bills)
+                amcs_processed.append({
+                    'amc_number': amc.amc_number,
+                    'client_name': _get_client_name(amc.client),
+                    'bills_created': len(amc_bills)
+                })
+            
+            except Exception as e:
+                logger.error(f"Error processing AMC {amc.amc_number}: {str(e)}", exc_info=True)
+                continue
+        
+        total_bills_created = len(bills_to_create)
+        notifications_to_create = []
+        
+        # Notify all superadmins (owners) if bills were created
+        if total_bills_created > 0:
+            notification_title = f"New AMC Billing Records Generated"
+            notification_message = (
+                f"{total_bills_created} new AMC billing record(s) have been generated automatically.\n\n"
+                f"AMCs processed:\n"
+            )
+            
+            for amc_info in amcs_processed:
+                notification_message += (
+                    f"- AMC {amc_info['amc_number']} ({amc_info['client_name']}): "
+                    f"{amc_info['bills_created']} bill(s)\n"
+                )
+            
+            notifications_to_create = [
+                Notification(
+                    recipient=admin,
+                    title=notification_title,
+                    message=notification_message,
+                    type=Notification.Type.AMC,
+                    channel=Notification.Channel.IN_APP,
+                    created_by=system_user
+                )
+                for admin in admins
+            ]
+        
+        # Only the writes run inside the transaction; everything above is reads and Python
+        with transaction.atomic():
+            # Insert all new billing records in multi-row batches
+            AMCBilling.objects.bulk_create(bills_to_create, batch_size=BULK_CREATE_BATCH_SIZE)
+            Notification.objects.bulk_create(notifications_to_create, batch_size=BULK_CREATE_BATCH_SIZE)
+        
+        for billing in bills_to_create:
+            logger.info(f"Created billing record {billing.bill_number} for AMC {billing.amc.amc_number} "
+                      f"period {billing.period_from} to {billing.period_to}, amount: {billing.amount}")
+        
+        total_notifications_sent = len(notifications_to_create)
+        if total_notifications_sent:
+            logger.info(f"Sent {total_notifications_sent} notifications to superadmins (owners) about new billing records")
         
         result = {
             'status': 'success',
@@ -383,27 +427,47 @@ def _calculate_billing_periods(amc, today):
     Returns:
         list: List of dictionaries with period_from, period_to, and amount
     """
-    try:
-        from dateutil.relativedelta import relativedelta
-        USE_RELATIVEDELTA = True
-    except ImportError:
-        USE_RELATIVEDELTA = False
+    # Periods already billed; served from the prefetched billings when available
+    existing_periods = {(billing.period_from, billing.period_to) for billing in amc.billings.all()}
     
-    periods = []
+    period_dates = _compute_period_dates(amc.billing_cycle, amc.start_date, amc.end_date, amc.amount)
     
-    # Calculate number of billing periods per year based on billing cycle
-    billing_cycle_periods = {
-        AMC.BillingCycle.MONTHLY: 12,
-        AMC.BillingCycle.QUARTERLY: 4,
-        AMC.BillingCycle.HALF_YEARLY: 2,
-        AMC.BillingCycle.YEARLY: 1,
-    }
+    # Only generate if period end date has passed (period_end <= today)
+    # This means the billing period has completed and bill should be generated,
+    # and skip periods whose billing record already exists
+    return [
+        {
+            'period_from': period_from,
+            'period_to': period_to,
+            'amount': amount_per_period
+        }
+        for period_from, period_to, amount_per_period in period_dates
+        if period_to <= today and (period_from, period_to) not in existing_periods
+    ]
+
+
+@lru_cache(maxsize=1024)
+def _compute_period_dates(billing_cycle, start_date, end_date, amount):
+    """
+    Split an AMC contract into its billing periods.
     
-    periods_per_year = billing_cycle_periods.get(amc.billing_cycle, 4)
+    Pure date arithmetic with no database access, so results are cached;
+    AMCs sharing a contract shape reuse the same period list.
+    
+    Args:
+        billing_cycle: AMC billing cycle
+        start_date: Contract start date
+        end_date: Contract end date
+        amount: Total contract amount
+    
+    Returns:
+        tuple: Tuple of (period_from, period_to, amount_per_period) tuples
+    """
+    periods_per_year = BILLING_PERIODS_PER_YEAR.get(billing_cycle, 4)
     
     # Calculate total number of periods in the contract
     # Example: 1 Jan 2025 to 31 Dec 2025 = 1 year, quarterly = 4 periods
-    contract_duration_days = (amc.end_date - amc.start_date).days + 1
+    contract_duration_days = (end_date - start_date).days + 1
     contract_duration_years = contract_duration_days / 365.25
     total_periods = int(periods_per_year * contract_duration_years)
     
@@ -413,82 +477,41 @@ def _calculate_billing_periods(amc, today):
     
     # Calculate amount per period (divide total amount by number of periods)
     # Example: Rs 500 / 4 periods = Rs 125 per period
-    amount_per_period = amc.amount / total_periods
+    amount_per_period = amount / total_periods
     amount_per_period = round(amount_per_period, 2)
     
-    # Calculate period duration in months for date calculations
-    period_months = {
-        AMC.BillingCycle.MONTHLY: 1,
-        AMC.BillingCycle.QUARTERLY: 3,
-        AMC.BillingCycle.HALF_YEARLY: 6,
-        AMC.BillingCycle.YEARLY: 12,
-    }
+    # Period duration in months for date calculations
+    months_per_period = BILLING_PERIOD_MONTHS.get(billing_cycle, 3)
     
-    months_per_period = period_months.get(amc.billing_cycle, 3)
+    periods = []
     
     # Generate periods from start_date to end_date
-    current_period_start = amc.start_date
+    current_period_start = start_date
     
-    while current_period_start <= amc.end_date:
+    while current_period_start <= end_date:
         # Calculate period end date using relativedelta for accurate month/year calculations
-        if USE_RELATIVEDELTA:
-            period_end = current_period_start + relativedelta(months=months_per_period) - timedelta(days=1)
-        else:
-            # Fallback if dateutil is not available
-            if amc.billing_cycle == AMC.BillingCycle.MONTHLY:
-                if current_period_start.month == 12:
-                    period_end = date(current_period_start.year + 1, 1, 1) - timedelta(days=1)
-                else:
-                    period_end = date(current_period_start.year, current_period_start.month + 1, 1) - timedelta(days=1)
-            elif amc.billing_cycle == AMC.BillingCycle.QUARTERLY:
-                month = current_period_start.month + 3
-                year = current_period_start.year
-                if month > 12:
-                    month -= 12
-                    year += 1
-                period_end = date(year, month, 1) - timedelta(days=1)
-            elif amc.billing_cycle == AMC.BillingCycle.HALF_YEARLY:
-                month = current_period_start.month + 6
-                year = current_period_start.year
-                if month > 12:
-                    month -= 12
-                    year += 1
-                period_end = date(year, month, 1) - timedelta(days=1)
-            else:  # YEARLY
-                period_end = date(current_period_start.year + 1, current_period_start.month, current_period_start.day) - timedelta(days=1)
+        period_end = current_period_start + relativedelta(months=months_per_period) - timedelta(days=1)
         
         # Ensure period_end doesn't exceed AMC end_date
-        if period_end > amc.end_date:
-            period_end = amc.end_date
-        
-        # Only generate if period end date has passed (period_end <= today)
-        # This means the billing period has completed and bill should be generated
-        if period_end <= today:
-            # Check if this period's billing record already exists
-            existing = AMCBilling.objects.filter(
-                amc=amc,
-                period_from=current_period_start,
-                period_to=period_end
-            ).exists()
-            
-            if not existing:
-                periods.append({
-                    'period_from': current_period_start,
-                    'period_to': period_end,
-                    'amount': amount_per_period
-                })
+        if period_end > end_date:
+            period_end = end_date
+        
+        periods.append((current_period_start, period_end, amount_per_period))
         
         # Move to next period (start from day after period_end)
         current_period_start = period_end + timedelta(days=1)
     
-    return periods
+    return tuple(periods)
 
 
-def _generate_bill_number(amc, period_from):
+def _generate_bill_number(amc, period_from, taken):
     """
     Generate a unique bill number for an AMC billing record.
     
     Format: AMC-{amc_number}-{YYYY}-{MM}-{period_number}
+    
+    `taken` holds the bill numbers already in use for this AMC's prefix;
+    the returned number is added to it so later calls skip it too.
     """
     # Get the billing cycle to determine period number
     if amc.billing_cycle == AMC.BillingCycle.MONTHLY:
@@ -507,10 +530,11 @@ def _generate_bill_number(amc, period_from):
     # Ensure uniqueness by appending a counter if needed
     counter = 1
     base_bill_number = bill_number
-    while AMCBilling.objects.filter(bill_number=bill_number).exists():
+    while bill_number in taken:
         bill_number = f"{base_bill_number}-{counter}"
         counter += 1
     
+    taken.add(bill_number)
     return bill_number
 
 
@@ -537,12 +561,7 @@ def send_scheduled_notification(self, title, message, notification_type, channel
         created_by_id: ID of the user who created the notification (optional)
     """
     try:
-        from django.utils import timezone as tz
-        from django.contrib.auth.models import User
-        from Notifications.models import Notification
-        from HR.models import Employee
-        
-        now = tz.now()
+        now = timezone.now()
         
         # Get the user who created the notification
         created_by = None
@@ -567,44 +586,50 @@ def send_scheduled_notification(self, title, message, notification_type, channel
         notifications_sent = 0
         errors = []
         
-        # Mark all matching scheduled notifications as sent
-        for notification in scheduled_notifications:
-            try:
-                notification.sent_at = now
-                notification.scheduled_at = None  # Clear scheduled_at since it's being sent now
-                notification.save()
-                notifications_sent += 1
-                logger.info(f"Marked scheduled notification {notification.id} as sent for {notification.recipient.username}")
-            except Exception as e:
-                error_msg = f"Error marking notification {notification.id} as sent: {str(e)}"
-                errors.append(error_msg)
-                logger.error(error_msg, exc_info=True)
+        # Mark all matching scheduled notifications as sent in a single UPDATE;
+        # scheduled_at is cleared since they're being sent now
+        try:
+            notifications_sent = scheduled_notifications.update(
+                sent_at=now,
+                scheduled_at=None,
+                updated_at=now
+            )
+            if notifications_sent:
+                logger.info(f"Marked {notifications_sent} scheduled notification(s) as sent")
+        except Exception as e:
+            error_msg = f"Error marking scheduled notifications as sent: {str(e)}"
+            errors.append(error_msg)
+            logger.error(error_msg, exc_info=True)
         
         # If no scheduled notifications found, create new ones (fallback for old scheduled tasks)
         if notifications_sent == 0:
             logger.warning(f"No scheduled notifications found matching criteria. Creating new notifications as fallback.")
-            employees = Employee.objects.select_related('profile', 'profile__user').all()
-            
-            for employee in employees:
-                if employee.profile and employee.profile.user:
-                    user = employee.profile.user
-                    try:
-                        notification = Notification.objects.create(
-                            recipient=user,
-                            title=title,
-                            message=message,
-                            type=notification_type,
-                            channel=channel,
-                            scheduled_at=None,  # Not scheduled anymore, being sent now
-                            sent_at=now,  # Mark as sent immediately
-                            created_by=created_by
-                        )
-                        notifications_sent += 1
-                        logger.info(f"Created and sent scheduled notification to {user.username} (fallback)")
-                    except Exception as e:
-                        error_msg = f"Error creating notification for {user.username}: {str(e)}"
-                        errors.append(error_msg)
-                        logger.error(error_msg, exc_info=True)
+            # Stream just the employees' user ids rather than loading full rows
+            recipient_ids = list(
+                Employee.objects.filter(profile__user__isnull=False)
+                .values_list('profile__user_id', flat=True)
+                .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+            )
+            try:
+                Notification.objects.bulk_create([
+                    Notification(
+                        recipient_id=user_id,
+                        title=title,
+                        message=message,
+                        type=notification_type,
+                        channel=channel,
+                        scheduled_at=None,  # Not scheduled anymore, being sent now
+                        sent_at=now,  # Mark as sent immediately
+                        created_by=created_by
+                    )
+                    for user_id in recipient_ids
+                ], batch_size=BULK_CREATE_BATCH_SIZE)
+                notifications_sent = len(recipient_ids)
+                logger.info(f"Created and sent scheduled notification to {notifications_sent} employee(s) (fallback)")
+            except Exception as e:
+                error_msg = f"Error creating fallback notifications: {str(e)}"
+                errors.append(error_msg)
+                logger.error(error_msg, exc_info=True)
         
         result = {
             'status': 'success',
@@ -631,11 +656,7 @@ def send_scheduled_notifications(self):
     created with scheduled_at but not handled by the scheduled task.
     """
     try:
-        from django.utils import timezone as tz
-        import pytz
-        
-        kolkata_tz = pytz.timezone('Asia/Kolkata')
-        now = tz.now().astimezone(kolkata_tz)
+        now = timezone.now().astimezone(KOLKATA_TZ)
         
         # Find notifications that are scheduled and due
         scheduled_notifications = Notification.objects.filter(
@@ -647,16 +668,17 @@ def send_scheduled_notifications(self):
         sent_count = 0
         errors = []
         
-        for notification in scheduled_notifications:
-            try:
-                notification.sent_at = now
-                notification.scheduled_at = None  # Clear scheduled_at since it's being sent now
-                notification.save()
-                sent_count += 1
-                logger.info(f"Sent scheduled notification {notification.id} to {notification.recipient.username}")
-            except Exception as e:
-                errors.append(f"Error sending notification {notification.id}: {str(e)}")
-                logger.error(f"Error sending scheduled notification {notification.id}: {str(e)}")
+        # Mark every due notification as sent in a single UPDATE;
+        # scheduled_at is cleared since they're being sent now
+        try:
+            sent_count = scheduled_notifications.update(
+                sent_at=now,
+                scheduled_at=None,
+                updated_at=now
+            )
+        except Exception as e:
+            errors.append(f"Error sending scheduled notifications: {str(e)}")
+            logger.error(f"Error sending scheduled notifications: {str(e)}")
         
         result = {
             'status': 'success',
@@ -684,21 +706,23 @@ def send_tender_emd_reminders(self):
     and sends reminders to owners.
     """
     try:
-        from django.utils import timezone as tz
-        import pytz
-        from datetime import timedelta
-        
-        kolkata_tz = pytz.timezone('Asia/Kolkata')
-        now = tz.now().astimezone(kolkata_tz)
+        now = timezone.now().astimezone(KOLKATA_TZ)
         today = now.date()
         
-        # Find tenders with pending EMD deposits (not refunded)
-        pending_deposits = TenderDeposit.objects.filter(
-            is_refunded=False,
-            tender__status__in=[Tender.Status.FILED, Tender.Status.AWARDED]
-        ).select_related('tender')
+        # Find tenders with pending EMD deposits (not refunded); the database totals
+        # them per tender. Only the columns the message uses are fetched, as tuples
+        pending_filter = Q(deposits__is_refunded=False)
+        tenders = list(
+            Tender.objects.filter(status__in=[Tender.Status.FILED, Tender.Status.AWARDED])
+            .annotate(
+                pending_total=Sum('deposits__dd_amount', filter=pending_filter),
+                pending_count=Count('deposits', filter=pending_filter),
+            )
+            .filter(pending_count__gt=0)
+            .values_list('id', 'name', 'pending_total', 'pending_count')
+        )
         
-        if not pending_deposits.exists():
+        if not tenders:
             logger.info("No pending EMD deposits found. Skipping reminders.")
             return {
                 'status': 'skipped',
@@ -706,66 +730,78 @@ def send_tender_emd_reminders(self):
                 'date': str(today)
             }
         
-        # Group deposits by tender for better notification messages
-        tender_deposits = {}
-        for deposit in pending_deposits:
-            tender_id = deposit.tender.id
-            if tender_id not in tender_deposits:
-                tender_deposits[tender_id] = {
-                    'tender': deposit.tender,
-                    'deposits': []
-                }
-            tender_deposits[tender_id]['deposits'].append(deposit)
-        
         # Get system user for created_by field
-        system_user = User.objects.filter(is_superuser=True).first()
+        admins = _get_superadmins()
+        system_user = admins[0] if admins else None
         if not system_user:
             logger.warning("No superuser found. Notifications will have null created_by.")
         
         reminder_count = 0
         total_amount = 0
+        notifications_to_create = []
         
-        for tender_id, tender_data in tender_deposits.items():
-            tender = tender_data['tender']
-            deposits = tender_data['deposits']
-            
-            # Calculate total amount for this tender
-            tender_total = sum(deposit.dd_amount for deposit in deposits)
-            total_amount += tender_total
+        # Pending deposit lines for the messages, grouped by tender
+        deposit_lines = defaultdict(list)
+        pending_deposits = TenderDeposit.objects.filter(
+            tender_id__in=[tender_id for tender_id, _, _, _ in tenders],
+            is_refunded=False
+        ).values_list('tender_id', 'deposit_type', 'dd_number', 'dd_amount')
+        for tender_id, deposit_type, dd_number, dd_amount in pending_deposits:
+            deposit_lines[tender_id].append(f"- {deposit_type} (DD No: {dd_number}, Amount: ₹{dd_amount})")
+        
+        for tender_id, tender_name, pending_total, pending_count in tenders:
+            total_amount += pending_total
             
             # Create notification message
-            deposit_count = len(deposits)
-            deposit_list = "\n".join([
-                f"- {deposit.deposit_type} (DD No: {deposit.dd_number}, Amount: ₹{deposit.dd_amount})"
-                for deposit in deposits
-            ])
+            deposit_list = "\n".join(deposit_lines[tender_id])
             
-            notification_title = f"Tender EMD Collection Reminder: {tender.name}"
+            notification_title = f"Tender EMD Collection Reminder: {tender_name}"
             notification_message = (
-                f"Reminder: {tender.name} has {deposit_count} pending EMD deposit(s) that need to be collected.\n\n"
+                f"Reminder: {tender_name} has {pending_count} pending EMD deposit(s) that need to be collected.\n\n"
                 f"Pending Deposits:\n{deposit_list}\n\n"
-                f"Total Amount: ₹{tender_total}\n\n"
+                f"Total Amount: ₹{pending_total:.2f}\n\n"
                 f"Please collect the EMD deposits at the earliest."
             )
             
-            # Send notification to all owners
-            try:
-                send_notification_to_owners(
+            # One reminder per owner, inserted together after the loop
+            notifications_to_create.extend(
+                Notification(
+                    recipient=admin,
                     title=notification_title,
                     message=notification_message,
-                    notification_type="Tender",
+                    type=Notification.Type.TENDER,
+                    channel=Notification.Channel.IN_APP,
+                    sent_at=now,
                     created_by=system_user
                 )
-                reminder_count += 1
-                logger.info(f"Sent EMD reminder for tender {tender.name} (ID: {tender_id})")
-            except Exception as e:
-                logger.error(f"Error sending EMD reminder for tender {tender.name}: {str(e)}")
+                for admin in admins
+            )
+        
+        # Send notifications to all owners
+        try:
+            notifications = Notification.objects.bulk_create(
+                notifications_to_create, batch_size=BULK_CREATE_BATCH_SIZE
+            )
+            reminder_count = len(tenders)
+            logger.info(f"Sent EMD reminders for {reminder_count} tender(s) to {len(admins)} owner(s)")
+        except Exception as e:
+            notifications = []
+            logger.error(f"Error sending EMD reminders: {str(e)}")
+        
+        for notification in notifications:
+            send_fcm_push_notification(
+                user=notification.recipient,
+                title=notification.title,
+                message=notification.message,
+                notification_type=notification.type,
+                notification_id=notification.id
+            )
         
         result = {
             'status': 'success',
             'date': str(today),
             'reminders_sent': reminder_count,
-            'tenders_with_pending_emds': len(tender_deposits),
+            'tenders_with_pending_emds': len(tenders),
             'total_pending_amount': float(total_amount)
         }
         
@@ -789,22 +825,19 @@ def auto_close_awarded_tenders(self):
     These tenders will be automatically marked as 'Closed'.
     """
     try:
-        from django.utils import timezone as tz
-        import pytz
-        
-        kolkata_tz = pytz.timezone('Asia/Kolkata')
-        now = tz.now().astimezone(kolkata_tz)
+        now = timezone.now().astimezone(KOLKATA_TZ)
         today = now.date()
         
         logger.info(f"Starting auto-close awarded tenders task for {today}")
         
-        # Find tenders with status 'Awarded' and end_date < today
-        tenders_to_close = Tender.objects.filter(
+        # Close tenders with status 'Awarded' and end_date < today in a single UPDATE;
+        # update() skips auto_now, so set updated_at here
+        closed_count = Tender.objects.filter(
             status=Tender.Status.AWARDED,
             end_date__lt=today
-        )
+        ).update(status=Tender.Status.CLOSED, updated_at=timezone.now())
         
-        if not tenders_to_close.exists():
+        if closed_count == 0:
             logger.info("No awarded tenders found that need to be closed.")
             return {
                 'status': 'skipped',
@@ -812,25 +845,13 @@ def auto_close_awarded_tenders(self):
                 'date': str(today)
             }
         
-        closed_count = 0
-        errors = []
-        
-        for tender in tenders_to_close:
-            try:
-                tender.status = Tender.Status.CLOSED
-                tender.save()
-                closed_count += 1
-                logger.info(f"Auto-closed tender {tender.name} (ID: {tender.id}) - end_date was {tender.end_date}")
-            except Exception as e:
-                error_msg = f"Error closing tender {tender.name} (ID: {tender.id}): {str(e)}"
-                errors.append(error_msg)
-                logger.error(error_msg, exc_info=True)
+        logger.info(f"Auto-closed {closed_count} awarded tender(s) whose end_date was before {today}")
         
         result = {
             'status': 'success',
             'date': str(today),
             'closed_count': closed_count,
-            'errors': errors if errors else None
+            'errors': None
         }
         
         logger.info(f"Auto-close awarded tenders completed: {result}")
@@ -852,14 +873,9 @@ def send_scheduled_email(self, template_id, recipients, placeholder_values=None)
         placeholder_values: Dictionary of placeholder values to replace in the email body
     """
     try:
-        from django.core.mail import send_mail
-        from django.conf import settings
-        from Notifications.models import EmailTemplate
-        from django.utils import timezone as tz
-        
-        # Get the email template
+        # Get the email template; cached between runs and cleared when the template is edited
         try:
-            template = EmailTemplate.objects.get(id=template_id)
+            template_name, subject, body = get_email_template_content(template_id)
         except EmailTemplate.DoesNotExist:
             logger.error(f"Email template {template_id} not found")
             return {
@@ -868,44 +884,52 @@ def send_scheduled_email(self, template_id, recipients, placeholder_values=None)
             }
         
         # Replace placeholders in subject and body
-        subject = template.subject
-        body = template.body
-        
+        # Templates sent without values go out exactly as stored
         if placeholder_values:
-            for key, value in placeholder_values.items():
-                placeholder = f"{{{{{key}}}}}"
-                subject = subject.replace(placeholder, str(value))
-                body = body.replace(placeholder, str(value))
+            subject, body = _apply_placeholders(subject, body, placeholder_values)
         
         # Send email to all recipients
         email_sent_count = 0
         errors = []
+        from_email = settings.DEFAULT_FROM_EMAIL or settings.EMAIL_HOST_USER
         
-        for recipient_email in recipients:
-            try:
-                send_mail(
-                    subject=subject,
-                    message=body,  # Plain text fallback
-                    from_email=settings.DEFAULT_FROM_EMAIL or settings.EMAIL_HOST_USER,
-                    recipient_list=[recipient_email],
-                    html_message=body,  # HTML content
-                    fail_silently=False,
-                )
-                email_sent_count += 1
-                logger.info(f"Sent scheduled email to {recipient_email} using template {template.name}")
-            except Exception as e:
-                error_msg = f"Error sending email to {recipient_email}: {str(e)}"
-                errors.append(error_msg)
-                logger.error(error_msg)
+        # Reuse one SMTP connection for every recipient instead of reconnecting per email
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as e:
+            # Each send below retries the connection and records its own error
+            logger.warning(f"Could not open email connection: {str(e)}")
+        
+        try:
+            for recipient_email in recipients:
+                try:
+                    email = EmailMultiAlternatives(
+                        subject=subject,
+                        body=body,  # Plain text fallback
+                        from_email=from_email,
+                        to=[recipient_email],
+                        connection=connection,
+                    )
+                    email.attach_alternative(body, "text/html")  # HTML content
+                    email.send()
+                    email_sent_count += 1
+                    logger.info(f"Sent scheduled email to {recipient_email} using template {template_name}")
+                except Exception as e:
+                    error_msg = f"Error sending email to {recipient_email}: {str(e)}"
+                    errors.append(error_msg)
+                    logger.error(error_msg)
+        finally:
+            connection.close()
         
         result = {
             'status': 'success',
             'template_id': template_id,
-            'template_name': template.name,
+            'template_name': template_name,
             'recipients_count': len(recipients),
             'sent_count': email_sent_count,
             'errors': errors if errors else None,
-            'timestamp': str(tz.now())
+            'timestamp': str(timezone.now())
         }
         
         logger.info(f"Scheduled email sent: {result}")
@@ -916,6 +940,36 @@ def send_scheduled_email(self, template_id, recipients, placeholder_values=None)
         raise
 
 
+def _apply_placeholders(subject, body, placeholder_values):
+    """
+    Replace {{key}} placeholders in an email subject and body.
+    
+    Every placeholder is resolved in one pass over the text rather than one
+    replace() per key; unknown placeholders are left as they are.
+    
+    Args:
+        subject: Email subject
+        body: Email body
+        placeholder_values: Dictionary of placeholder values
+    
+    Returns:
+        tuple: (subject, body) with placeholders replaced
+    """
+    values = {str(key): str(value) for key, value in placeholder_values.items()}
+    pattern = _placeholder_pattern(frozenset(values))
+    
+    def replace(match):
+        return values[match.group(1)]
+    
+    return pattern.sub(replace, subject), pattern.sub(replace, body)
+
+
+@lru_cache(maxsize=256)
+def _placeholder_pattern(keys):
+    """Compiled regex matching {{key}} for any of the given keys; reused for the same key set"""
+    return re.compile(r"\{\{(" + "|".join(map(re.escape, keys)) + r")\}\}")
+
+
 @shared_task(bind=True, name='Scheduler.tasks.mark_absent_employees')
 def mark_absent_employees(self):
     """
@@ -931,12 +985,7 @@ def mark_absent_employees(self):
     4. If no attendance record exists, creates an "Absent" attendance record
     """
     try:
-        from django.utils import timezone as tz
-        import pytz
-        from HR.models import Employee, Attendance
-        
-        kolkata_tz = pytz.timezone('Asia/Kolkata')
-        now = tz.now().astimezone(kolkata_tz)
+        now = timezone.now().astimezone(KOLKATA_TZ)
         today = now.date()
         
         # Skip if today is Sunday (weekday 6)
@@ -951,20 +1000,15 @@ def mark_absent_employees(self):
         logger.info(f"Starting absent marking for employees on {today}")
         
         # Get system user for created_by field
-        system_user = User.objects.filter(is_superuser=True).first()
+        admins = _get_superadmins()
+        system_user = admins[0] if admins else None
         if not system_user:
             logger.warning("No superuser found. Attendance records will have null created_by.")
         
         # Get all active employees
-        employees = Employee.objects.select_related('profile', 'profile__user').all()
-        
-        if not employees.exists():
-            logger.warning("No employees found. Skipping absent marking.")
-            return {
-                'status': 'skipped',
-                'reason': 'No employees found',
-                'date': str(today)
-            }
+        # Only id and employee_code are read; skip the profile/user join and wide columns
+        employees = Employee.objects.only('id', 'employee_code')
+        total_employees = 0
         
         marked_absent_count = 0
         already_marked_count = 0
@@ -972,6 +1016,7 @@ def mark_absent_employees(self):
         
         with transaction.atomic():
             for employee in employees:
+                total_employees += 1
                 try:
                     # Check if attendance record already exists for today
                     existing_attendance = Attendance.objects.filter(
@@ -1003,12 +1048,20 @@ def mark_absent_employees(self):
                     logger.error(error_msg, exc_info=True)
                     continue
         
+        if total_employees == 0:
+            logger.warning("No employees found. Skipping absent marking.")
+            return {
+                'status': 'skipped',
+                'reason': 'No employees found',
+                'date': str(today)
+            }
+        
         result = {
             'status': 'success',
             'date': str(today),
             'marked_absent_count': marked_absent_count,
             'already_marked_count': already_marked_count,
-            'total_employees': employees.count(),
+            'total_employees': total_employees,
             'errors': errors if errors else None
         }
         
@@ -1,7 +1,13 @@
+import logging
+from decimal import Decimal
+from posixpath import basename
+
 from rest_framework import serializers
 from .models import Task, TaskAttachment, TaskResource
 from Analytics.models import ActivityLog
 
+logger = logging.getLogger(__name__)
+
 
 class TaskAttachmentSerializer(serializers.ModelSerializer):
     file_url = serializers.SerializerMethodField()
@@ -25,7 +31,8 @@ class TaskAttachmentSerializer(serializers.ModelSerializer):
     
     def get_file_name(self, obj):
         if obj.file:
-            return obj.file.name.split('/')[-1]
+            # Storage names always use '/' separators, whatever the host OS
+            return basename(obj.file.name)
         return None
 
 
@@ -205,7 +212,8 @@ class TaskResourceCreateSerializer(serializers.ModelSerializer):
         unit_cost = data.get('unit_cost', 0)
         
         if 'total_cost' not in data or data['total_cost'] is None:
-            data['total_cost'] = float(quantity) * float(unit_cost)
+            # Decimal arithmetic so the stored cost isn't subject to float rounding
+            data['total_cost'] = Decimal(str(quantity)) * Decimal(str(unit_cost))
         
         return data
     
@@ -231,7 +239,7 @@ class TaskResourcesDashboardSerializer(serializers.ModelSerializer):
     """Serializer for task resources dashboard list"""
     employee_name = serializers.SerializerMethodField()
     project_name = serializers.CharField(source='project.name', read_only=True)
-    tender_name = serializers.SerializerMethodField()
+    tender_name = serializers.CharField(source='project.tender.name', read_only=True)
     resources_count = serializers.SerializerMethodField()
     grand_total = serializers.SerializerMethodField()
     resource_breakdown = serializers.SerializerMethodField()
@@ -252,40 +260,16 @@ class TaskResourcesDashboardSerializer(serializers.ModelSerializer):
             return full_name if full_name else user.username
         return None
     
-    def get_tender_name(self, obj):
-        """Get tender name"""
-        if obj.project and obj.project.tender:
-            return obj.project.tender.name
-        return None
-    
     def get_resources_count(self, obj):
         """Get number of resources used in this task"""
-        return obj.resources.count()
+        # Counted from the prefetched resources rather than a COUNT query per task
+        return len(obj.resources.all())
     
     def get_grand_total(self, obj):
         """Get grand total of all resources in this task"""
-        try:
-            from django.db.models import Sum
-            from django.db.models.functions import Coalesce
-            from decimal import Decimal
-            
-            total_result = obj.resources.aggregate(
-                total=Coalesce(Sum('total_cost'), 0)
-            )
-            total = total_result.get('total', 0) or 0
-            
-            # Handle Decimal type conversion
-            if isinstance(total, Decimal):
-                return float(total)
-            elif isinstance(total, (int, float)):
-                return float(total)
-            else:
-                return 0.0
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error calculating grand total for task {obj.id}: {str(e)}")
-            return 0.0
+        # Summed from the prefetched resources rather than an aggregate query per task;
+        # total_cost is a non-null DecimalField, so the sum is always a Decimal
+        return float(sum((resource.total_cost for resource in obj.resources.all()), Decimal('0')))
     
     def get_resource_breakdown(self, obj):
         """Get resource breakdown for this task"""
@@ -293,8 +277,6 @@ class TaskResourcesDashboardSerializer(serializers.ModelSerializer):
             resources = obj.resources.all()
             return TaskResourceBreakdownSerializer(resources, many=True).data
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Error getting resource breakdown for task {obj.id}: {str(e)}")
             return []
 
@@ -7,10 +7,12 @@ from django.db.models.functions import Coalesce
 from django.db import transaction
 from django.http import FileResponse
 from django.views.decorators.clickjacking import xframe_options_exempt
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from urllib.parse import quote
 from datetime import date, datetime, timedelta
 from calendar import monthrange
+from decimal import Decimal
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 import os
@@ -203,32 +205,30 @@ class TaskViewSet(viewsets.ModelViewSet):
             )
         
         # Calculate statistics
-        # Total tasks
-        total_tasks = tasks_queryset.count()
-        
-        # Pending approval (approval_status = pending)
-        pending_approval = tasks_queryset.filter(approval_status=Task.ApprovalStatus.PENDING).count()
-        
-        # In Progress (status = In Progress)
-        in_progress = tasks_queryset.filter(status=Task.Status.IN_PROGRESS).count()
-        
-        # Approved tasks (approval_status = approved)
-        approved_tasks = tasks_queryset.filter(approval_status=Task.ApprovalStatus.APPROVED).count()
+        # All task counts come from one scan of the filtered tasks
+        task_counts = tasks_queryset.aggregate(
+            # Total tasks
+            total_tasks=Count('id'),
+            # Pending approval (approval_status = pending)
+            pending_approval=Count('id', filter=Q(approval_status=Task.ApprovalStatus.PENDING)),
+            # In Progress (status = In Progress)
+            in_progress=Count('id', filter=Q(status=Task.Status.IN_PROGRESS)),
+            # Approved tasks (approval_status = approved)
+            approved_tasks=Count('id', filter=Q(approval_status=Task.ApprovalStatus.APPROVED)),
+        )
+        total_tasks = task_counts['total_tasks']
+        pending_approval = task_counts['pending_approval']
+        in_progress = task_counts['in_progress']
+        approved_tasks = task_counts['approved_tasks']
         
         # Total resource cost (sum of all TaskResource.total_cost for these tasks)
         try:
-            # Get task IDs for resource cost calculation
-            task_ids = list(tasks_queryset.values_list('id', flat=True))
-            
-            if task_ids:
-                total_resource_cost_result = TaskResource.objects.filter(
-                    task__in=task_ids
-                ).aggregate(
-                    total=Coalesce(Sum('total_cost'), 0)
-                )
-                total_resource_cost = total_resource_cost_result.get('total', 0) or 0
-            else:
-                total_resource_cost = 0
+            # Filter by a task subquery so the ids never leave the database
+            total_resource_cost = TaskResource.objects.filter(
+                task_id__in=tasks_queryset.values('id')
+            ).aggregate(
+                total=Coalesce(Sum('total_cost'), Decimal('0'))
+            )['total']
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
@@ -236,12 +236,11 @@ class TaskViewSet(viewsets.ModelViewSet):
             total_resource_cost = 0
         
         try:
-            from decimal import Decimal
-            
             # Ensure values are properly converted to Decimal
             # Handle Decimal types that might already be Decimal
             if isinstance(total_resource_cost, Decimal):
-                total_resource_cost_decimal = total_resource_cost
+                # Backends may return the SUM with extra scale; the serializer allows 2 places
+                total_resource_cost_decimal = total_resource_cost.quantize(Decimal('0.01'))
             elif total_resource_cost is None:
                 total_resource_cost_decimal = Decimal('0.00')
             else:
@@ -486,58 +485,64 @@ class TaskViewSet(viewsets.ModelViewSet):
             )
         
         try:
+            errors = []
+            
             with transaction.atomic():
-                # Get all valid tasks (no status restriction for approval)
-                tasks_to_approve = Task.objects.filter(id__in=task_ids)
+                # Get all valid tasks (no status restriction for approval),
+                # joined to the employee's user for the approval notifications
+                tasks_to_approve = Task.objects.select_related(
+                    'employee', 'employee__profile', 'employee__profile__user'
+                ).filter(id__in=task_ids)
+                approved = list(tasks_to_approve)
                 
-                approved_count = 0
-                skipped_count = 0
-                errors = []
+                # Update only approval_status to approved (don't change task status),
+                # one UPDATE for the whole batch; update() skips auto_now, so set updated_at here
+                approved_count = Task.objects.filter(id__in=[task.id for task in approved]).update(
+                    approval_status=Task.ApprovalStatus.APPROVED,
+                    updated_by=request.user,
+                    updated_at=timezone.now()
+                )
                 
-                for task in tasks_to_approve:
-                    try:
-                        # Update only approval_status to approved (don't change task status)
-                        task.approval_status = Task.ApprovalStatus.APPROVED
-                        task.updated_by = request.user
-                        task.save()
-                        
-                        # Create activity log
-                        ActivityLog.objects.create(
-                            entity_type=ActivityLog.EntityType.TASK,
-                            entity_id=task.id,
-                            action=ActivityLog.Action.APPROVED,
-                            description=f"Task {task.task_name} approved",
-                            created_by=request.user
-                        )
-                        
-                        # Notify employee when task is approved
-                        if task.employee and task.employee.profile and task.employee.profile.user:
-                            employee_user = task.employee.profile.user
-                            send_notification_to_user(
-                                user=employee_user,
-                                title="Task Approved",
-                                message=f"Your task '{task.task_name}' has been approved",
-                                notification_type="Task",
-                                created_by=request.user
-                            )
-                        
-                        approved_count += 1
-                    except Exception as e:
-                        errors.append(f"Error approving task {task.id}: {str(e)}")
+                # Create activity logs
+                ActivityLog.objects.bulk_create([
+                    ActivityLog(
+                        entity_type=ActivityLog.EntityType.TASK,
+                        entity_id=task.id,
+                        action=ActivityLog.Action.APPROVED,
+                        description=f"Task {task.task_name} approved",
+                        created_by=request.user
+                    )
+                    for task in approved
+                ])
                 
                 # Count skipped tasks (tasks that don't exist or already approved)
-                skipped_count = len(task_ids) - tasks_to_approve.count()
+                skipped_count = len(task_ids) - len(approved)
                 
                 # Note: We don't add "Tasks not found" to errors array because:
                 # 1. It's already represented by skipped_count
                 # 2. Missing tasks are expected (could be deleted by another user or stale selection)
                 # 3. Errors array should only contain actual errors (database errors, permission errors, etc.)
-                
-                return Response({
-                    'approved_count': approved_count,
-                    'skipped_count': skipped_count,
-                    'errors': errors if errors else None
-                }, status=status.HTTP_200_OK)
+            
+            # Notify employees once the approvals are committed, so slow pushes don't hold the row locks
+            for task in approved:
+                try:
+                    if task.employee and task.employee.profile and task.employee.profile.user:
+                        employee_user = task.employee.profile.user
+                        send_notification_to_user(
+                            user=employee_user,
+                            title="Task Approved",
+                            message=f"Your task '{task.task_name}' has been approved",
+                            notification_type="Task",
+                            created_by=request.user
+                        )
+                except Exception as e:
+                    errors.append(f"Error notifying employee for task {task.id}: {str(e)}")
+            
+            return Response({
+                'approved_count': approved_count,
+                'skipped_count': skipped_count,
+                'errors': errors if errors else None
+            }, status=status.HTTP_200_OK)
                 
         except Exception as e:
             return Response(
@@ -1502,7 +1507,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             
             # Calculate total_cost if not provided
             if total_cost is None:
-                total_cost = float(quantity) * float(unit_cost)
+                total_cost = Decimal(str(quantity)) * Decimal(str(unit_cost))
             
             resource.quantity = quantity
             resource.unit_cost = unit_cost
@@ -1682,7 +1687,7 @@ class TaskResourcesDashboardViewSet(viewsets.ReadOnlyModelViewSet):
                 task__in=task_ids
             ).aggregate(
                 total_count=Count('id'),
-                total_cost=Coalesce(Sum('total_cost'), 0)
+                total_cost=Coalesce(Sum('total_cost'), Decimal('0'))
             )
             total_resources = resource_stats['total_count'] or 0
             total_cost = resource_stats['total_cost'] or 0
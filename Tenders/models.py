@@ -28,6 +28,12 @@ class Tender(models.Model):
     updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, related_name="tenders_updated", blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Daily auto-close of awarded tenders past their end_date
+            models.Index(fields=['status', 'end_date'], name='tender_status_end_idx'),
+        ]
+
     def __str__(self):
         return self.name
 